@@ -2,7 +2,7 @@ from typing import Dict, Optional, Any
 import weakref
 from fastapi import FastAPI, HTTPException, WebSocket, Request, WebSocketDisconnect, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, HTMLResponse, FileResponse, PlainTextResponse, JSONResponse
+from fastapi.responses import RedirectResponse, HTMLResponse, FileResponse, PlainTextResponse, JSONResponse, Response
 from pydantic import BaseModel
 from typing import List
 import os
@@ -36,7 +36,7 @@ import shutil
 import uuid
 
 # Import tool handling functionality
-from tools_handlers import handle_tool_call, TOOL_DEFINITIONS
+from tools_handlers import handle_tool_call, tools_json_bytes
 
 # Import codebase indexer
 from codebase_indexer import CodebaseIndexer
@@ -163,7 +163,7 @@ async def list_tools():
     """
     Get a list of available tools.
     """
-    return {"tools": TOOL_DEFINITIONS}
+    return Response(content=tools_json_bytes(), media_type="application/json")
 
 # Codebase indexing API endpoints
 @app.get("/api/codebase/overview")
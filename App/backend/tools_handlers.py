@@ -1346,15 +1346,14 @@ async def handle_tool_call(tool_name: str, params: Dict[str, Any]) -> Dict[str,
     Returns:
         Result of the tool execution
     """
-    if tool_name not in TOOL_HANDLERS:
+    # Get the handler function with a single lookup
+    handler = TOOL_HANDLERS.get(tool_name)
+    if handler is None:
         return {
             "success": False,
             "error": f"Unknown tool: {tool_name}"
         }
     
-    # Get the handler function
-    handler = TOOL_HANDLERS[tool_name]
-    
     try:
         # Call the handler with parameters (no workspace_dir needed since cwd is set)
         result = await handler(**params)
@@ -1650,6 +1649,20 @@ TOOL_DEFINITIONS = [
     }
 ]
 
+# The schema never changes at runtime, so encode the /api/tools/list payload once
+_TOOLS_LIST_BYTES = json.dumps({"tools": TOOL_DEFINITIONS}).encode("utf-8")
+
+
+def tools_json_bytes() -> bytes:
+    """
+    Get the pre-serialized tool list payload.
+    
+    Returns:
+        UTF-8 encoded JSON of the form {"tools": TOOL_DEFINITIONS}
+    """
+    return _TOOLS_LIST_BYTES
+
+
 # Dictionary mapping tool names to handler functions (defined at end after all functions)
 TOOL_HANDLERS = {
     "read_file": read_file,
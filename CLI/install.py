@@ -7,8 +7,11 @@ This script installs Pointer CLI and ensures the 'pointer' command is available
 
 import os
 import sys
+import functools
 import subprocess
 import shutil
+import sysconfig
+import importlib.util
 from pathlib import Path
 import platform
 
@@ -23,31 +26,36 @@ def check_python_version():
 
 def check_pip():
     """Check if pip is available."""
-    try:
-        subprocess.run([sys.executable, "-m", "pip", "--version"], 
-                      check=True, capture_output=True)
+    if importlib.util.find_spec("pip") is not None:
         print("✅ pip is available")
         return True
-    except subprocess.CalledProcessError:
-        print("❌ Error: pip is not available")
-        return False
+    print("❌ Error: pip is not available")
+    return False
 
 def install_pointer_cli():
     """Install Pointer CLI in development mode."""
     print("🔧 Installing Pointer CLI in development mode...")
     
     try:
-        # Install in development mode
-        result = subprocess.run([
-            sys.executable, "-m", "pip", "install", "-e", "."
-        ], check=True, capture_output=True, text=True)
+        uv_path = shutil.which("uv")
+        if uv_path:
+            # uv resolves and installs in parallel; let its progress show live
+            subprocess.run([
+                uv_path, "pip", "install", "-e", ".", "--python", sys.executable
+            ], check=True)
+        else:
+            # Install in development mode
+            subprocess.run([
+                sys.executable, "-m", "pip", "install", "-e", "."
+            ], check=True, capture_output=True, text=True)
         
         print("✅ Installation successful!")
         return True
         
     except subprocess.CalledProcessError as e:
         print(f"❌ Installation failed: {e}")
-        print(f"Error output: {e.stderr}")
+        if e.stderr:
+            print(f"Error output: {e.stderr}")
         return False
 
 def verify_installation():
@@ -65,23 +73,23 @@ def verify_installation():
 
 def get_scripts_directory():
     """Get the Python scripts directory."""
-    # Method 1: Try to get from pip show
+    # Method 1: Ask sysconfig where entry points are installed
     try:
-        result = subprocess.run([
-            sys.executable, "-m", "pip", "show", "-f", "pointer-cli"
-        ], capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            for line in result.stdout.split('\n'):
-                if 'Location:' in line:
-                    location = line.split('Location:')[1].strip()
-                    scripts_dir = Path(location).parent / "Scripts" if platform.system() == "Windows" else Path(location).parent / "bin"
-                    if scripts_dir.exists():
-                        return scripts_dir
+        scripts_dir = Path(sysconfig.get_path("scripts"))
+        if scripts_dir.exists():
+            return scripts_dir
+    except Exception:
+        pass
+    
+    # Method 2: The same lookup for a --user install
+    try:
+        scripts_dir = Path(sysconfig.get_path("scripts", f"{os.name}_user"))
+        if scripts_dir.exists():
+            return scripts_dir
     except Exception:
         pass
     
-    # Method 2: Try to find from site-packages
+    # Method 3: Try to find from site-packages
     try:
         import site
         site_packages = site.getsitepackages()[0]
@@ -91,7 +99,7 @@ def get_scripts_directory():
     except Exception:
         pass
     
-    # Method 3: Try to find from sys.executable
+    # Method 4: Try to find from sys.executable
     try:
         python_exe = Path(sys.executable)
         scripts_dir = python_exe.parent / "Scripts" if platform.system() == "Windows" else python_exe.parent / "bin"
@@ -100,7 +108,7 @@ def get_scripts_directory():
     except Exception:
         pass
     
-    # Method 4: Try to find from user site-packages
+    # Method 5: Try to find from user site-packages
     try:
         import site
         user_site = site.getusersitepackages()
@@ -110,7 +118,7 @@ def get_scripts_directory():
     except Exception:
         pass
     
-    # Method 5: Try common locations
+    # Method 6: Try common locations
     try:
         if platform.system() == "Windows":
             # Common Windows locations
@@ -135,6 +143,53 @@ def get_scripts_directory():
     
     return None
 
+# PATH directories already probed for writability, so retries don't re-probe
+_writable_path_cache = {}
+
+@functools.lru_cache(maxsize=1)
+def _system_path_dirs():
+    """Get system directories that are never writable for a regular user, resolved once."""
+    deny = []
+    for var in ("WINDIR", "SystemRoot", "ProgramFiles", "ProgramFiles(x86)"):
+        value = os.environ.get(var)
+        if value:
+            try:
+                deny.append(Path(value).resolve())
+            except Exception:
+                pass
+    return tuple(deny)
+
+def _is_under(path, parent):
+    """Check whether path is parent or lies inside it."""
+    try:
+        path.relative_to(parent)
+        return True
+    except ValueError:
+        return False
+
+def is_writable_path_dir(path_path):
+    """Check if a PATH directory can hold pointer.bat, caching the result."""
+    if path_path in _writable_path_cache:
+        return _writable_path_cache[path_path]
+    
+    writable = False
+    system_dirs = _system_path_dirs()
+    if (path_path.is_dir()
+            and not any(_is_under(path_path, d) for d in system_dirs)
+            and os.access(path_path, os.W_OK)):
+        # os.access can be optimistic on Windows ACLs, so confirm with a real write
+        test_file = path_path / "test_write.tmp"
+        try:
+            with open(test_file, 'w') as f:
+                f.write("test")
+            test_file.unlink()  # Delete test file
+            writable = True
+        except Exception:
+            writable = False
+    
+    _writable_path_cache[path_path] = writable
+    return writable
+
 def create_pointer_batch_file():
     """Create a pointer.bat file in a directory that's in PATH."""
     try:
@@ -147,24 +202,17 @@ python -m pointer_cli %*"""
         for path_dir in path_dirs:
             if path_dir.strip():
                 try:
-                    path_path = Path(path_dir.strip())
-                    if path_path.exists() and path_path.is_dir():
-                        # Test if we can write to this directory
-                        test_file = path_path / "test_write.tmp"
-                        try:
-                            with open(test_file, 'w') as f:
-                                f.write("test")
-                            test_file.unlink()  # Delete test file
-                            
-                            # Create pointer.bat in this directory
-                            batch_file = path_path / "pointer.bat"
-                            with open(batch_file, 'w') as f:
-                                f.write(batch_content)
-                            
-                            print(f"✅ Created pointer.bat in: {batch_file}")
-                            return True
-                        except Exception:
-                            continue
+                    path_path = Path(path_dir.strip()).resolve()
+                    if not is_writable_path_dir(path_path):
+                        continue
+                    
+                    # Create pointer.bat in this directory
+                    batch_file = path_path / "pointer.bat"
+                    with open(batch_file, 'w') as f:
+                        f.write(batch_content)
+                    
+                    print(f"✅ Created pointer.bat in: {batch_file}")
+                    return True
                 except Exception:
                     continue
         
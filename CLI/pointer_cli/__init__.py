@@ -6,12 +6,27 @@ __version__ = "1.0.0"
 __author__ = "Pointer CLI Team"
 __email__ = "team@pointer-cli.dev"
 
+import importlib
+
 from .main import main
-from .core import PointerCLI
-from .config import Config
-from .chat import ChatInterface
-from .tools import ToolManager
-from .modes import ModeManager
+
+# Heavier modules (aiohttp, the chat loop) load on first access so that
+# quick invocations such as `pointer --version` start fast
+_LAZY_EXPORTS = {
+    "PointerCLI": ".core",
+    "Config": ".config",
+    "ChatInterface": ".chat",
+    "ToolManager": ".tools",
+    "ModeManager": ".modes",
+}
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "main",
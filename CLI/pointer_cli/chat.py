@@ -4,9 +4,14 @@ Chat interface for Pointer CLI.
 
 import asyncio
 import json
+import queue
+import random
 import re
+import threading
 import time
-from typing import Dict, Any, List, Optional, AsyncGenerator
+from collections import deque
+from itertools import islice
+from typing import Dict, Any, List, Optional, AsyncGenerator, Callable, Deque, Iterable, Tuple
 from pathlib import Path
 
 import aiohttp
@@ -21,25 +26,308 @@ from .config import Config
 from .utils import truncate_output
 from .codebase_context import CodebaseContext
 
+# orjson parses bytes directly and is much faster on small payloads; it is optional
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+
+def _serialize(obj: Any) -> bytes:
+    """Encode a request body to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+# Thinking blocks emitted by reasoning models
+_THINK_RE = re.compile(r'<think>(.*?)</think>', re.DOTALL)
+
+# Server-sent event line endings
+_SSE_EOL_RE = re.compile(rb'\r\n|\r|\n')
+
+# Fenced ```tool blocks in AI responses
+_TOOL_BLOCK_RE = re.compile(r'```tool\s*\n(.*?)\n```', re.DOTALL)
+
+def _prompt_usage(usage: Optional[Dict[str, Any]]) -> Tuple[int, int]:
+    """Return (prompt_tokens, cached_tokens) from an OpenAI-style usage block."""
+    if not usage:
+        return 0, 0
+    details = usage.get("prompt_tokens_details") or {}
+    return usage.get("prompt_tokens") or 0, details.get("cached_tokens") or 0
+
+# Spinner frames for the streaming panel
+_SPINNER_CHARS = ("⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏")
+
+# Minimum seconds between rebuilds of the streaming panel
+_RENDER_INTERVAL = 0.08
+
+
+class _RetriesExhausted(Exception):
+    """A transient API failure that outlasted its retries, so a fallback request would only repeat it."""
+
+
+class _ThinkingSplitter:
+    """Route streamed deltas into thinking and main buffers as they arrive."""
+    
+    OPEN_TAG = "<think>"
+    CLOSE_TAG = "</think>"
+    
+    def __init__(self):
+        self.thinking_parts: List[str] = []
+        self.main_parts: List[str] = []
+        self.in_think = False
+        self._pending = ""  # Possible partial tag carried over to the next delta
+    
+    def feed(self, content: str) -> None:
+        """Consume one delta, only scanning the new text plus a short tail."""
+        text = self._pending + content
+        self._pending = ""
+        
+        while text:
+            tag = self.CLOSE_TAG if self.in_think else self.OPEN_TAG
+            target = self.thinking_parts if self.in_think else self.main_parts
+            index = text.find(tag)
+            
+            if index != -1:
+                if index:
+                    target.append(text[:index])
+                text = text[index + len(tag):]
+                self.in_think = not self.in_think
+                continue
+            
+            # Hold back a suffix that could be the start of the tag
+            keep = 0
+            for size in range(min(len(tag) - 1, len(text)), 0, -1):
+                if tag.startswith(text[-size:]):
+                    keep = size
+                    break
+            
+            if keep:
+                target.append(text[:-keep])
+                self._pending = text[-keep:]
+            else:
+                target.append(text)
+            break
+    
+    def flush(self) -> None:
+        """Emit any held-back text once the stream has ended."""
+        if self._pending:
+            target = self.thinking_parts if self.in_think else self.main_parts
+            target.append(self._pending)
+            self._pending = ""
+    
+    def get_thinking(self) -> str:
+        """Get the thinking text received so far."""
+        return "".join(self.thinking_parts).strip()
+    
+    def get_main(self) -> str:
+        """Get the non-thinking text received so far."""
+        return "".join(self.main_parts).strip()
+
+
+def _resolve_future(future: "asyncio.Future[Any]", setter: Callable[[Any], None], value: Any) -> None:
+    """Complete a future from the loop thread unless it was cancelled meanwhile."""
+    if not future.done():
+        setter(value)
+
+
+class _InputReader:
+    """Run blocking terminal prompts one at a time on a single daemon thread.
+    
+    A prompt still waiting on the terminal must not keep the process alive
+    after Ctrl+C, and executor threads are joined at interpreter exit.
+    """
+    
+    def __init__(self):
+        # (loop, future, prompt_func, args) for each pending prompt
+        self._requests: "queue.SimpleQueue[Tuple[Any, ...]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+    
+    def submit(self, loop: asyncio.AbstractEventLoop, prompt_func: Callable[..., Any], args: Tuple[Any, ...]) -> "asyncio.Future[Any]":
+        """Queue a prompt and return a future for its result on the given loop."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="pointer-input", daemon=True)
+            self._thread.start()
+        future = loop.create_future()
+        self._requests.put((loop, future, prompt_func, args))
+        return future
+    
+    def _run(self) -> None:
+        while True:
+            loop, future, prompt_func, args = self._requests.get()
+            if future.cancelled():
+                continue
+            try:
+                outcome = (future.set_result, prompt_func(*args))
+            except BaseException as e:
+                outcome = (future.set_exception, e)
+            try:
+                loop.call_soon_threadsafe(_resolve_future, future, *outcome)
+            except RuntimeError:
+                # The loop was closed while the prompt was waiting
+                pass
+
+
+_LOADING_TITLE = "[bold blue]AI Response[/bold blue] | Tokens: 0 | Speed: 0.0 tokens/sec"
+_STREAMING_TITLE = "[bold green]AI Response[/bold green] | Tokens: {tokens} | Speed: {speed:.1f} tokens/sec"
+
+
+def _response_body(thinking_content: str, main_content: str, show_thinking: bool) -> Text:
+    """Build the response panel body as plain Text so content is never parsed as markup."""
+    body = Text()
+    if thinking_content and show_thinking:
+        # Create a combined display with thinking and main content
+        body.append("Thinking:\n", style="bright_black")
+        body.append(thinking_content)
+        body.append("\n\nResponse:\n", style="green")
+    body.append(main_content)
+    return body
+
+
+def _render_stream_panel(token_count: int, splitter: _ThinkingSplitter, start_time: float, show_thinking: bool) -> Panel:
+    """Build the live AI response panel for the current streaming state."""
+    if token_count == 0:
+        return Panel("⠋ Generating response...", title="[bold blue]AI Response[/bold blue]", border_style="blue")
+    
+    # Show the actual response content as it streams
+    thinking_content = splitter.get_thinking()
+    main_content = splitter.get_main()
+    if not (thinking_content or main_content):
+        # Still loading, show spinner
+        spinner_char = _SPINNER_CHARS[token_count % len(_SPINNER_CHARS)]
+        return Panel(f"{spinner_char} Generating response...", title=_LOADING_TITLE, border_style="blue")
+    
+    elapsed = time.time() - start_time
+    tokens_per_sec = token_count / elapsed if elapsed > 0 else 0
+    
+    return Panel(
+        _response_body(thinking_content, main_content, show_thinking),
+        title=_STREAMING_TITLE.format(tokens=token_count, speed=tokens_per_sec),
+        border_style="green"
+    )
+
+
 class ChatInterface:
     """Chat interface for natural language interaction."""
     
+    # Maximum number of messages kept in memory for the session
+    HISTORY_LIMIT = 200
+    
+    # Number of most recent history messages sent with each request
+    HISTORY_WINDOW = 10
+    
+    # Character budget for those messages before older replies are shortened
+    HISTORY_CHAR_BUDGET = 24000
+    COLLAPSED_REPLY_CHARS = 1000
+    
+    # Transient HTTP statuses worth retrying, and the first backoff delay in seconds
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    RETRY_BASE_DELAY = 0.5
+    
+    # Static instructions, joined once. They lead the system prompt so every
+    # request shares a byte-identical prefix that providers can cache.
+    _SYSTEM_INSTRUCTIONS = "\n".join([
+        "You are Pointer CLI, an AI-powered local codebase assistant.",
+        "You help users interact with their codebase through natural language.",
+        "",
+        "Available Tools:",
+        "- read_file: Read file contents (args: path)",
+        "- write_file: Write content to file (args: path, content)",
+        "- edit_file: Edit file with specific changes (args: path, changes, insert_after, insert_before, content)",
+        "- search_files: Search for files by pattern (args: pattern, directory, recursive, include_hidden)",
+        "- search_content: Search for content in files (args: query, directory, recursive, include_hidden)",
+        "- run_command: Execute shell commands (args: command, cwd)",
+        "- list_directory: List directory contents (args: path)",
+        "- get_file_info: Get file information (args: path)",
+        "- create_diff: Show diff between versions (args: old_content, new_content)",
+        "",
+        "Tool Format:",
+        "When you need to use a tool, respond with:",
+        "```tool",
+        "name: tool_name",
+        "args:",
+        "  arg1: value1",
+        "  arg2: value2",
+        "```",
+        "",
+        "Examples:",
+        "```tool",
+        "name: read_file",
+        "args:",
+        "  path: C:\\path\\to\\file.txt",
+        "```",
+        "```tool",
+        "name: write_file",
+        "args:",
+        "  path: C:\\path\\to\\file.txt",
+        "  content: Hello, World!",
+        "```",
+        "```tool",
+        "name: edit_file",
+        "args:",
+        "  path: C:\\path\\to\\file.txt",
+        "  insert_after: \"<div class=\\\"languages-grid\\\">\"",
+        "  content: \"<div class=\\\"language-card\\\">New content here</div>\"",
+        "```",
+        "",
+        "Guidelines:",
+        "- Be concise and helpful",
+        "- Always show diffs when editing files",
+        "- Explain what you're doing",
+        "- Ask for confirmation for destructive operations",
+        "- Use the most appropriate tool for each task",
+        "- Use the codebase context to understand the project structure and key files",
+    ])
+    
     def __init__(self, config: Config, console: Console):
         self.config = config
         self.console = console
         self.session = None
-        self.conversation_history = []
+        self._input_reader = _InputReader()
+        self._headers: Dict[str, str] = {}
+        self._url = ""
+        self._api_signature = None
+        self.conversation_history: Deque[Dict[str, Any]] = deque(maxlen=self.HISTORY_LIMIT)
         self.codebase_context = CodebaseContext(config)
         
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared HTTP session on first use so turns reuse one keep-alive connection."""
+        if self.session is None or self.session.closed:
+            timeout = aiohttp.ClientTimeout(total=self.config.api.timeout)
+            # Every request goes to the same model endpoint, so size the pool for one host
+            connector = aiohttp.TCPConnector(
+                limit=10,
+                limit_per_host=10,
+                force_close=False,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True,
+            )
+            self.session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+        
+        # Request headers and URL only change when the API settings do
+        api_signature = (self.config.api.base_url, self.config.api.api_key)
+        if api_signature != self._api_signature:
+            self._headers = {"Content-Type": "application/json"}
+            if self.config.api.api_key:
+                self._headers["Authorization"] = f"Bearer {self.config.api.api_key}"
+            self._url = f"{self.config.api.base_url}/v1/chat/completions"
+            self._api_signature = api_signature
+        
+        return self.session
+    
+    async def read_input(self, prompt_func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking terminal prompt without blocking the event loop."""
+        # Prompts share one dedicated thread so the default executor stays free
+        # and terminal reads never overlap
+        return await self._input_reader.submit(asyncio.get_running_loop(), prompt_func, args)
+    
     async def get_user_input(self) -> str:
         """Get user input from the terminal."""
         try:
-            # Use asyncio to handle input without blocking
-            loop = asyncio.get_event_loop()
-            user_input = await loop.run_in_executor(
-                None, 
-                lambda: Prompt.ask("\n[bold blue]You[/bold blue]")
-            )
+            user_input = await self.read_input(Prompt.ask, "\n[bold blue]You[/bold blue]")
             return user_input.strip()
         except KeyboardInterrupt:
             raise
@@ -49,41 +337,11 @@ class ChatInterface:
     
     async def get_ai_response(self, message: str, context: Dict[str, Any]) -> str:
         """Get AI response for the given message with loading animation."""
-        try:
-            # Add message to conversation history
-            self.conversation_history.append({
-                "role": "user",
-                "content": message
-            })
-            
-            # Prepare the request
-            request_data = await self._prepare_request(message, context)
-            
-            # Try streaming first, fallback to non-streaming if it fails
-            try:
-                response = await self._make_streaming_api_call(request_data)
-            except Exception as streaming_error:
-                # Fallback to non-streaming if streaming fails
-                self.console.print(f"[yellow]Streaming failed, using fallback: {streaming_error}[/yellow]")
-                # Show simple loading message for fallback
-                self.console.print("[blue]Generating response...[/blue]")
-                response = await self._make_api_call(request_data)
-            
-            # Add response to conversation history
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": response
-            })
-            
-            return response
-            
-        except Exception as e:
-            error_msg = f"Error getting AI response: {e}"
-            self.console.print(f"[red]{error_msg}[/red]")
-            raise Exception(error_msg)  # Re-raise instead of returning error message
+        response, *_ = await self.get_ai_response_with_tokens(message, context)
+        return response
     
-    async def get_ai_response_with_tokens(self, message: str, context: Dict[str, Any]) -> tuple[str, int]:
-        """Get AI response for the given message and return token count."""
+    async def get_ai_response_with_tokens(self, message: str, context: Dict[str, Any]) -> tuple[str, int, int, int]:
+        """Get AI response for the given message and return (response, tokens, prompt_tokens, cached_tokens)."""
         try:
             # Add message to conversation history
             self.conversation_history.append({
@@ -96,13 +354,18 @@ class ChatInterface:
             
             # Try streaming first, fallback to non-streaming if it fails
             try:
-                response, tokens = await self._make_streaming_api_call_with_tokens(request_data)
+                response, tokens, prompt_tokens, cached_tokens = await self._stream_call(request_data)
+            except _RetriesExhausted:
+                # The server is failing, not streaming; a fallback would retry it all again
+                raise
             except Exception as streaming_error:
                 # Fallback to non-streaming if streaming fails
                 self.console.print(f"[yellow]Streaming failed, using fallback: {streaming_error}[/yellow]")
                 # Show simple loading message for fallback
                 self.console.print("[blue]Generating response...[/blue]")
-                response, tokens = await self._make_api_call_with_tokens(request_data)
+                plain_request = {**request_data, "stream": False}
+                plain_request.pop("stream_options", None)
+                response, tokens, prompt_tokens, cached_tokens = await self._plain_call(plain_request)
             
             # Add response to conversation history
             self.conversation_history.append({
@@ -110,7 +373,7 @@ class ChatInterface:
                 "content": response
             })
             
-            return response, tokens
+            return response, tokens, prompt_tokens, cached_tokens
             
         except Exception as e:
             error_msg = f"Error getting AI response: {e}"
@@ -125,317 +388,197 @@ class ChatInterface:
         # Prepare messages
         messages = [{"role": "system", "content": system_prompt}]
         
-        # Add conversation history (last 10 messages to avoid token limits)
-        recent_history = self.conversation_history[-10:]
-        messages.extend(recent_history)
-        
-        # Add current message
-        messages.append({"role": "user", "content": message})
+        # Add conversation history (last 10 messages to avoid token limits).
+        # The caller has already appended the current message to the history.
+        start = max(len(self.conversation_history) - self.HISTORY_WINDOW, 0)
+        recent_history = list(islice(self.conversation_history, start, None))
+        messages.extend(self._trim_history(recent_history))
         
         return {
             "model": self.config.api.model_name,
             "messages": messages,
             "temperature": 2,
-            "stream": True
+            "stream": True,
+            "stream_options": {"include_usage": True}
         }
     
+    def _trim_history(self, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Shorten older assistant replies when the history exceeds the character budget."""
+        total_chars = sum(len(msg.get("content") or "") for msg in history)
+        if total_chars <= self.HISTORY_CHAR_BUDGET:
+            return history
+        
+        trimmed = []
+        last_index = len(history) - 1
+        for index, msg in enumerate(history):
+            content = msg.get("content") or ""
+            if (total_chars > self.HISTORY_CHAR_BUDGET
+                    and index < last_index
+                    and msg.get("role") == "assistant"
+                    and len(content) > self.COLLAPSED_REPLY_CHARS):
+                total_chars -= len(content) - self.COLLAPSED_REPLY_CHARS
+                msg = {**msg, "content": content[:self.COLLAPSED_REPLY_CHARS] + "\n... [earlier reply truncated]"}
+            trimmed.append(msg)
+        
+        return trimmed
+    
     def _build_system_prompt(self, context: Dict[str, Any]) -> str:
         """Build the system prompt with context."""
+        # Session-specific details come after the static instructions
         prompt_parts = [
-            "You are Pointer CLI, an AI-powered local codebase assistant.",
-            "You help users interact with their codebase through natural language.",
+            self._SYSTEM_INSTRUCTIONS,
             "",
             "Current Context:",
             f"- Project Root: {context.get('project_root', 'None')}",
             f"- Current Directory: {context.get('current_directory', 'None')}",
             f"- Git Repository: {context.get('is_git_repo', False)}",
-            "",
         ]
         
         # Add codebase context if enabled
         if self.config.codebase.include_context:
             codebase_context = self.codebase_context.get_context_for_prompt()
             if codebase_context and codebase_context != "No codebase context available.":
-                prompt_parts.append(codebase_context)
                 prompt_parts.append("")
-        
-        prompt_parts.extend([
-            "Available Tools:",
-            "- read_file: Read file contents (args: path)",
-            "- write_file: Write content to file (args: path, content)",
-            "- edit_file: Edit file with specific changes (args: path, changes, insert_after, insert_before, content)",
-            "- search_files: Search for files by pattern (args: pattern, directory, recursive, include_hidden)",
-            "- search_content: Search for content in files (args: query, directory, recursive, include_hidden)",
-            "- run_command: Execute shell commands (args: command, cwd)",
-            "- list_directory: List directory contents (args: path)",
-            "- get_file_info: Get file information (args: path)",
-            "- create_diff: Show diff between versions (args: old_content, new_content)",
-            "",
-            "Tool Format:",
-            "When you need to use a tool, respond with:",
-            "```tool",
-            "name: tool_name",
-            "args:",
-            "  arg1: value1",
-            "  arg2: value2",
-            "```",
-            "",
-            "Examples:",
-            "```tool",
-            "name: read_file",
-            "args:",
-            "  path: C:\\path\\to\\file.txt",
-            "```",
-            "```tool",
-            "name: write_file",
-            "args:",
-            "  path: C:\\path\\to\\file.txt",
-            "  content: Hello, World!",
-            "```",
-            "```tool",
-            "name: edit_file",
-            "args:",
-            "  path: C:\\path\\to\\file.txt",
-            "  insert_after: \"<div class=\\\"languages-grid\\\">\"",
-            "  content: \"<div class=\\\"language-card\\\">New content here</div>\"",
-            "```",
-            "",
-            "Guidelines:",
-            "- Be concise and helpful",
-            "- Always show diffs when editing files",
-            "- Explain what you're doing",
-            "- Ask for confirmation for destructive operations",
-            "- Use the most appropriate tool for each task",
-            "- Use the codebase context to understand the project structure and key files",
-        ])
+                prompt_parts.append(codebase_context)
         
         return "\n".join(prompt_parts)
     
-    async def _make_streaming_api_call(self, request_data: Dict[str, Any]) -> str:
-        """Make streaming API call with loading animation and token counting."""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.config.api.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
-        
-        headers = {
-            "Content-Type": "application/json",
-        }
-        
-        if self.config.api.api_key:
-            headers["Authorization"] = f"Bearer {self.config.api.api_key}"
-        
-        url = f"{self.config.api.base_url}/v1/chat/completions"
-        
-        try:
-            full_response = ""
-            token_count = 0
-            start_time = time.time()
-            
-            # Use Rich Live for streaming the entire AI response
-            from rich.live import Live
-            from rich.text import Text
-            from rich.panel import Panel
-            
-            def make_response_display():
-                if token_count == 0:
-                    return Panel("⠋ Generating response...", title="[bold blue]AI Response[/bold blue]", border_style="blue")
-                else:
-                    elapsed = time.time() - start_time
-                    tokens_per_sec = token_count / elapsed if elapsed > 0 else 0
-                    spinner_chars = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-                    spinner_char = spinner_chars[token_count % len(spinner_chars)]
-                    
-                    # Show the actual response content as it streams
-                    if full_response.strip():
-                        # Split response into thinking and main content
-                        thinking_content, main_content = self._split_ai_response(full_response.strip())
-                        
-                        # If we have thinking content and it's enabled, show it
-                        if thinking_content and self.config.ui.show_thinking:
-                            # Create a combined display with thinking and main content
-                            combined_content = f"[bright_black]Thinking:[/bright_black]\n{thinking_content}\n\n[green]Response:[/green]\n{main_content}"
-                        else:
-                            combined_content = main_content
-                        
-                        return Panel(
-                            combined_content,
-                            title=f"[bold green]AI Response[/bold green] | Tokens: {token_count} | Speed: {tokens_per_sec:.1f} tokens/sec",
-                            border_style="green"
-                        )
-                    else:
-                        # Still loading, show spinner
-                        return Panel(
-                            f"{spinner_char} Generating response...",
-                            title="[bold blue]AI Response[/bold blue] | Tokens: 0 | Speed: 0.0 tokens/sec",
-                            border_style="blue"
-                        )
-            
-            # Create initial display
-            current_display = make_response_display()
-            
-            with Live(current_display, console=self.console, refresh_per_second=10) as live:
-                async with self.session.post(url, json=request_data, headers=headers) as response:
-                    if response.status == 200:
-                        async for line in response.content:
-                            line = line.decode('utf-8').strip()
-                            
-                            if line.startswith('data: '):
-                                data_str = line[6:]  # Remove 'data: ' prefix
-                                
-                                if data_str == '[DONE]':
-                                    break
-                                
-                                try:
-                                    data = json.loads(data_str)
-                                    
-                                    if 'choices' in data and len(data['choices']) > 0:
-                                        choice = data['choices'][0]
-                                        if 'delta' in choice and 'content' in choice['delta']:
-                                            content = choice['delta']['content']
-                                            full_response += content
-                                            token_count += 1
-                                            
-                                            # Update the live display with streaming content
-                                            current_display = make_response_display()
-                                            live.update(current_display)
-                                
-                                except json.JSONDecodeError:
-                                    continue
-                    else:
-                        error_text = await response.text()
-                        raise Exception(f"API error {response.status}: {error_text}")
-            
-            # No need to show final stats - they're already in the panel title
+    async def _post_with_retry(self, body: bytes) -> aiohttp.ClientResponse:
+        """POST to the chat completions endpoint, retrying transient failures with backoff.
+        
+        Transient statuses get up to api.max_retries attempts; a connection
+        error is retried once. Raises _RetriesExhausted when either runs out.
+        """
+        attempts = max(self.config.api.max_retries, 1)
+        status_failures = 0
+        connection_retried = False
+        retry = 0
+        
+        while True:
+            try:
+                response = await self.session.post(self._url, data=body, headers=self._headers)
+            except aiohttp.ClientConnectionError as e:
+                # The request may already have reached the model, so don't hammer it
+                if connection_retried:
+                    raise _RetriesExhausted(f"Network error: {e}") from e
+                connection_retried = True
+            else:
+                if response.status not in self.RETRY_STATUSES:
+                    return response
+                
+                status_failures += 1
+                if status_failures >= attempts:
+                    error_text = await response.text()
+                    response.release()
+                    raise _RetriesExhausted(f"API error {response.status}: {error_text}")
+                response.release()
             
-            return full_response
-        
-        except aiohttp.ClientError as e:
-            raise Exception(f"Network error: {e}")
-        except Exception as e:
-            raise Exception(f"Streaming error: {e}")
+            # Exponential backoff with a little jitter
+            await asyncio.sleep(self.RETRY_BASE_DELAY * 2 ** retry + random.random() * 0.1)
+            retry += 1
     
-    async def _make_streaming_api_call_with_tokens(self, request_data: Dict[str, Any]) -> tuple[str, int]:
-        """Make streaming API call and return response with token count."""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.config.api.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
-        
-        headers = {
-            "Content-Type": "application/json",
-        }
-        
-        if self.config.api.api_key:
-            headers["Authorization"] = f"Bearer {self.config.api.api_key}"
-        
-        url = f"{self.config.api.base_url}/v1/chat/completions"
+    async def _stream_call(self, request_data: Dict[str, Any]) -> tuple[str, int, int, int]:
+        """Make streaming API call and return response with token and prompt usage counts."""
+        self._ensure_session()
         
         try:
-            full_response = ""
+            parts: List[str] = []
+            splitter = _ThinkingSplitter()
             token_count = 0
+            char_count = 0
+            usage = None
             start_time = time.time()
-            
-            # Use Rich Live for streaming the entire AI response
-            from rich.live import Live
-            from rich.text import Text
-            from rich.panel import Panel
-            
-            def make_response_display():
-                if token_count == 0:
-                    return Panel("⠋ Generating response...", title="[bold blue]AI Response[/bold blue]", border_style="blue")
-                else:
-                    elapsed = time.time() - start_time
-                    tokens_per_sec = token_count / elapsed if elapsed > 0 else 0
-                    spinner_chars = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-                    spinner_char = spinner_chars[token_count % len(spinner_chars)]
-                    
-                    # Show the actual response content as it streams
-                    if full_response.strip():
-                        # Split response into thinking and main content
-                        thinking_content, main_content = self._split_ai_response(full_response.strip())
-                        
-                        # If we have thinking content and it's enabled, show it
-                        if thinking_content and self.config.ui.show_thinking:
-                            # Create a combined display with thinking and main content
-                            combined_content = f"[bright_black]Thinking:[/bright_black]\n{thinking_content}\n\n[green]Response:[/green]\n{main_content}"
-                        else:
-                            combined_content = main_content
-                        
-                        return Panel(
-                            combined_content,
-                            title=f"[bold green]AI Response[/bold green] | Tokens: {token_count} | Speed: {tokens_per_sec:.1f} tokens/sec",
-                            border_style="green"
-                        )
-                    else:
-                        # Still loading, show spinner
-                        return Panel(
-                            f"{spinner_char} Generating response...",
-                            title="[bold blue]AI Response[/bold blue] | Tokens: 0 | Speed: 0.0 tokens/sec",
-                            border_style="blue"
-                        )
+            last_render = 0.0
+            show_thinking = self.config.ui.show_thinking
             
             # Create initial display
-            current_display = make_response_display()
+            current_display = _render_stream_panel(token_count, splitter, start_time, show_thinking)
             
-            with Live(current_display, console=self.console, refresh_per_second=10) as live:
-                async with self.session.post(url, json=request_data, headers=headers) as response:
+            with Live(current_display, console=self.console, auto_refresh=False) as live:
+                async with await self._post_with_retry(_serialize(request_data)) as response:
                     if response.status == 200:
-                        async for line in response.content:
-                            line = line.decode('utf-8').strip()
+                        async for data_bytes in self._iter_sse_events(response):
+                            if data_bytes == b'[DONE]':
+                                break
                             
-                            if line.startswith('data: '):
-                                data_str = line[6:]  # Remove 'data: ' prefix
+                            try:
+                                data = _json_loads(data_bytes)
                                 
-                                if data_str == '[DONE]':
-                                    break
+                                # Servers honouring stream_options send usage in a final chunk
+                                if data.get('usage'):
+                                    usage = data['usage']
                                 
-                                try:
-                                    data = json.loads(data_str)
-                                    
-                                    if 'choices' in data and len(data['choices']) > 0:
-                                        choice = data['choices'][0]
-                                        if 'delta' in choice and 'content' in choice['delta']:
-                                            content = choice['delta']['content']
-                                            full_response += content
-                                            token_count += 1
-                                            
-                                            # Update the live display with streaming content
-                                            current_display = make_response_display()
-                                            live.update(current_display)
-                                
-                                except json.JSONDecodeError:
-                                    continue
+                                if 'choices' in data and len(data['choices']) > 0:
+                                    choice = data['choices'][0]
+                                    content = choice.get('delta', {}).get('content')
+                                    if content:
+                                        parts.append(content)
+                                        splitter.feed(content)
+                                        # Deltas vary in size, so estimate ~4 characters per token
+                                        char_count += len(content)
+                                        token_count = (char_count + 3) // 4
+                                        
+                                        # Rebuild the display at most once per render interval
+                                        now = time.monotonic()
+                                        if now - last_render >= _RENDER_INTERVAL:
+                                            current_display = _render_stream_panel(token_count, splitter, start_time, show_thinking)
+                                            live.update(current_display, refresh=True)
+                                            last_render = now
+                            
+                            except ValueError:
+                                # json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
+                                continue
+                        
+                        # Prefer the server's count over the estimate when it sent one
+                        if usage and usage.get("completion_tokens"):
+                            token_count = usage["completion_tokens"]
+                        
+                        # Always render the complete response once the stream ends
+                        splitter.flush()
+                        live.update(_render_stream_panel(token_count, splitter, start_time, show_thinking), refresh=True)
                     else:
                         error_text = await response.text()
                         raise Exception(f"API error {response.status}: {error_text}")
             
             # No need to show final stats - they're already in the panel title
             
-            return full_response, token_count
+            return ("".join(parts), token_count, *_prompt_usage(usage))
         
+        except _RetriesExhausted:
+            raise
         except aiohttp.ClientError as e:
             raise Exception(f"Network error: {e}")
         except Exception as e:
             raise Exception(f"Streaming error: {e}")
     
-    async def _make_api_call_with_tokens(self, request_data: Dict[str, Any]) -> tuple[str, int]:
-        """Make API call and return response with token count."""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.config.api.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
-        
-        headers = {
-            "Content-Type": "application/json",
-        }
-        
-        if self.config.api.api_key:
-            headers["Authorization"] = f"Bearer {self.config.api.api_key}"
-        
-        url = f"{self.config.api.base_url}/v1/chat/completions"
+    async def _iter_sse_events(self, response: aiohttp.ClientResponse) -> AsyncGenerator[bytes, None]:
+        """Yield the raw payload of each `data:` line as soon as the line is complete."""
+        # Lines may end in LF, CRLF or CR, and a single event can be larger than
+        # aiohttp's readline limit, so frame the raw chunks ourselves
+        pending: List[bytes] = []
+        async for chunk in response.content.iter_any():
+            pending.append(chunk)
+            if b"\n" not in chunk and b"\r" not in chunk:
+                continue
+            
+            lines = _SSE_EOL_RE.split(b"".join(pending))
+            pending = [lines.pop()]
+            for line in lines:
+                if line.startswith(b"data:"):
+                    yield line[5:].strip()  # Remove 'data:' prefix
+        
+        line = b"".join(pending)
+        if line.startswith(b"data:"):
+            yield line[5:].strip()
+    
+    async def _plain_call(self, request_data: Dict[str, Any]) -> tuple[str, int, int, int]:
+        """Make API call and return response with token and prompt usage counts."""
+        self._ensure_session()
         
         try:
-            async with self.session.post(url, json=request_data, headers=headers) as response:
+            async with await self._post_with_retry(_serialize(request_data)) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _json_loads(await response.read())
                     
                     # Validate response structure
                     if "choices" not in data:
@@ -450,12 +593,13 @@ class ChatInterface:
                     if "content" not in data["choices"][0]["message"]:
                         raise Exception(f"Invalid API response: missing 'content' field in message. Message: {data['choices'][0]['message']}")
                     
-                    # Extract token count if available
+                    # Extract token counts if available
+                    usage = data.get("usage")
                     token_count = 0
-                    if "usage" in data and "total_tokens" in data["usage"]:
-                        token_count = data["usage"]["total_tokens"]
+                    if usage and "total_tokens" in usage:
+                        token_count = usage["total_tokens"]
                     
-                    return data["choices"][0]["message"]["content"], token_count
+                    return (data["choices"][0]["message"]["content"], token_count, *_prompt_usage(usage))
                 else:
                     error_text = await response.text()
                     raise Exception(f"API error {response.status}: {error_text}")
@@ -469,79 +613,38 @@ class ChatInterface:
     
     def _split_ai_response(self, response: str) -> tuple[str, str]:
         """Split AI response into thinking content and main content."""
-        import re
-        
-        # Find thinking blocks
-        think_match = re.search(r'<think>(.*?)</think>', response, flags=re.DOTALL)
-        
-        if think_match:
-            # Extract thinking content
-            thinking_content = think_match.group(1).strip()
-            
-            # Remove thinking blocks from main content
-            main_content = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL).strip()
-            
-            return thinking_content, main_content
-        else:
-            # No thinking content found
+        # Cheap substring test covers the common case of no thinking block
+        if '<think>' not in response:
             return "", response
-    
-    async def _make_api_call(self, request_data: Dict[str, Any]) -> str:
-        """Make API call to the AI service."""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.config.api.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
-        
-        headers = {
-            "Content-Type": "application/json",
-        }
-        
-        if self.config.api.api_key:
-            headers["Authorization"] = f"Bearer {self.config.api.api_key}"
-        
-        url = f"{self.config.api.base_url}/v1/chat/completions"
         
-        try:
-            async with self.session.post(url, json=request_data, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Validate response structure
-                    if "choices" not in data:
-                        raise Exception(f"Invalid API response: missing 'choices' field. Response: {data}")
-                    
-                    if not data["choices"] or len(data["choices"]) == 0:
-                        raise Exception("Invalid API response: empty choices array")
-                    
-                    if "message" not in data["choices"][0]:
-                        raise Exception(f"Invalid API response: missing 'message' field in choice. Choice: {data['choices'][0]}")
-                    
-                    if "content" not in data["choices"][0]["message"]:
-                        raise Exception(f"Invalid API response: missing 'content' field in message. Message: {data['choices'][0]['message']}")
-                    
-                    return data["choices"][0]["message"]["content"]
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"API error {response.status}: {error_text}")
+        # One pass finds the thinking blocks and keeps the text between them
+        thinking_content = None
+        main_parts = []
+        last = 0
+        for think_match in _THINK_RE.finditer(response):
+            if thinking_content is None:
+                thinking_content = think_match.group(1).strip()
+            main_parts.append(response[last:think_match.start()])
+            last = think_match.end()
+        
+        if thinking_content is None:
+            # No complete thinking block found
+            return "", response
         
-        except aiohttp.ClientError as e:
-            raise Exception(f"Network error: {e}")
-        except json.JSONDecodeError as e:
-            raise Exception(f"Invalid JSON response: {e}")
-        except KeyError as e:
-            raise Exception(f"Invalid API response structure: missing key {e}")
+        main_parts.append(response[last:])
+        return thinking_content, "".join(main_parts).strip()
     
     def parse_tools(self, response: str) -> List[Dict[str, Any]]:
         """Parse tools from AI response."""
         tools = []
         
-        # Look for tool blocks in the response
-        tool_pattern = r'```tool\s*\n(.*?)\n```'
-        matches = re.findall(tool_pattern, response, re.DOTALL)
+        if '```tool' not in response:
+            return tools
         
-        for match in matches:
+        # Look for tool blocks in the response
+        for match in _TOOL_BLOCK_RE.finditer(response):
             try:
-                tool_data = self._parse_tool_block(match)
+                tool_data = self._parse_tool_block(match.group(1))
                 if tool_data:
                     tools.append(tool_data)
             except Exception as e:
@@ -550,60 +653,67 @@ class ChatInterface:
         return tools
     
     def _parse_tool_block(self, block: str) -> Optional[Dict[str, Any]]:
-        """Parse a single tool block."""
-        lines = block.strip().split('\n')
+        """Parse a single tool block in one pass over its lines."""
         tool_data = {}
+        args = None
         current_key = None
         current_value = []
         in_multiline_block = False
         
-        for line in lines:
-            line = line.strip()
+        for raw_line in block.splitlines():
+            line = raw_line.strip()
             if not line:
                 continue
             
-            if ':' in line and not in_multiline_block:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                if key == "name":
-                    tool_data["name"] = value
-                elif key == "args":
-                    # Parse YAML-like args
-                    tool_data["args"] = self._parse_args(value)
-                else:
-                    # Check if this is a multi-line value (YAML block scalar)
-                    if value == "|":
-                        # Start of multi-line block
-                        current_key = key
-                        current_value = []
-                        in_multiline_block = True
-                    else:
-                        # Single line value
-                        if "args" not in tool_data:
-                            tool_data["args"] = {}
-                        tool_data["args"][key] = value
-            elif in_multiline_block:
+            if in_multiline_block:
                 # We're in a multi-line block, collect lines
                 if line.startswith("```") or line.startswith("---"):
                     # End of multi-line block
                     if current_key and current_value:
-                        if "args" not in tool_data:
-                            tool_data["args"] = {}
-                        tool_data["args"][current_key] = "\n".join(current_value).strip()
+                        if args is None:
+                            args = {}
+                        args[current_key] = "\n".join(current_value).strip()
                     current_key = None
                     current_value = []
                     in_multiline_block = False
                 else:
                     # Add line to current multi-line value
                     current_value.append(line)
+                continue
+            
+            if line[0] == '#':
+                continue
+            
+            key, sep, value = line.partition(':')
+            if not sep:
+                continue
+            key = key.strip()
+            value = value.strip()
+            
+            if key == "name":
+                tool_data["name"] = value
+            elif key == "args":
+                # Inline YAML-like args on the same line, if any
+                args = self._parse_args(value)
+            elif value == "|":
+                # Start of multi-line block (YAML block scalar)
+                current_key = key
+                current_value = []
+                in_multiline_block = True
+            else:
+                # Single line value
+                if args is None:
+                    args = {}
+                args[key] = value
         
         # Handle case where multi-line block ends at end of tool block
         if in_multiline_block and current_key and current_value:
-            if "args" not in tool_data:
-                tool_data["args"] = {}
-            tool_data["args"][current_key] = "\n".join(current_value).strip()
+            if args is None:
+                args = {}
+            args[current_key] = "\n".join(current_value).strip()
+        
+        if args is not None:
+            tool_data["args"] = args
         
         # Fix common parameter mismatches
         if tool_data.get("name") == "search_content" and "args" in tool_data:
@@ -619,29 +729,29 @@ class ChatInterface:
     def _parse_args(self, args_str: str) -> Dict[str, Any]:
         """Parse tool arguments."""
         args = {}
-        lines = args_str.split('\n')
         
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('#'):
+        for raw_line in args_str.splitlines():
+            line = raw_line.strip()
+            if not line or line[0] == '#':
                 continue
             
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                # Remove quotes if present
-                if value.startswith('"') and value.endswith('"'):
-                    value = value[1:-1]
-                elif value.startswith("'") and value.endswith("'"):
-                    value = value[1:-1]
-                
-                # Try to parse as JSON for complex values
-                try:
-                    args[key] = json.loads(value)
-                except json.JSONDecodeError:
-                    args[key] = value
+            key, sep, value = line.partition(':')
+            if not sep:
+                continue
+            key = key.strip()
+            value = value.strip()
+            
+            # Remove quotes if present
+            if value.startswith('"') and value.endswith('"'):
+                value = value[1:-1]
+            elif value.startswith("'") and value.endswith("'"):
+                value = value[1:-1]
+            
+            # Try to parse as JSON for complex values
+            try:
+                args[key] = json.loads(value)
+            except json.JSONDecodeError:
+                args[key] = value
         
         return args
     
@@ -653,11 +763,15 @@ class ChatInterface:
     
     def clear_history(self) -> None:
         """Clear conversation history."""
-        self.conversation_history = []
+        self.conversation_history.clear()
+    
+    def set_history(self, messages: Iterable[Dict[str, Any]]) -> None:
+        """Replace conversation history, keeping only the most recent messages."""
+        self.conversation_history = deque(messages, maxlen=self.HISTORY_LIMIT)
     
     def get_history(self) -> List[Dict[str, Any]]:
         """Get conversation history."""
-        return self.conversation_history.copy()
+        return list(self.conversation_history)
     
     def add_to_history(self, role: str, content: str) -> None:
         """Add message to conversation history."""
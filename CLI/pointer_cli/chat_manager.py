@@ -6,9 +6,11 @@ import json
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from dataclasses import dataclass, asdict
 
+from .utils import json_loads, json_dumps_bytes
+
 @dataclass
 class ChatMessage:
     """Represents a single chat message."""
@@ -30,25 +32,37 @@ class ChatSession:
 class ChatManager:
     """Manages chat sessions and persistence."""
     
+    # Metadata for every saved chat as of its last save, so listing doesn't
+    # parse full chat files; journaled messages are counted when listing
+    INDEX_FILENAME = "_index.json"
+    # Append-only log of messages added since a chat's last save
+    JOURNAL_SUFFIX = ".jsonl"
+    
     def __init__(self, config_dir: Path):
         self.config_dir = config_dir
         self.chats_dir = config_dir / "chats"
         self.chats_dir.mkdir(exist_ok=True)
+        self.index_file = self.chats_dir / self.INDEX_FILENAME
         self.current_chat: Optional[ChatSession] = None
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._index_stat: Optional[tuple] = None
+        self._journal_fd: Optional[int] = None
+        self._journal_chat_id: Optional[str] = None
     
     def create_new_chat(self, title: str = None) -> ChatSession:
         """Create a new chat session."""
+        now = datetime.now()
         if not title:
-            title = f"Chat {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+            title = f"Chat {now:%Y-%m-%d %H:%M}"
         
-        chat_id = f"chat_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        now = datetime.now().isoformat()
+        chat_id = f"chat_{now:%Y%m%d_%H%M%S}"
+        now_iso = now.isoformat()
         
         self.current_chat = ChatSession(
             id=chat_id,
             title=title,
-            created_at=now,
-            last_modified=now,
+            created_at=now_iso,
+            last_modified=now_iso,
             messages=[],
             total_tokens=0
         )
@@ -68,26 +82,19 @@ class ChatManager:
         # Update last modified
         chat.last_modified = datetime.now().isoformat()
         
-        # Convert to dict and save
-        chat_data = {
-            "id": chat.id,
-            "title": chat.title,
-            "created_at": chat.created_at,
-            "last_modified": chat.last_modified,
-            "total_tokens": chat.total_tokens,
-            "messages": [
-                {
-                    "role": msg.role,
-                    "content": msg.content,
-                    "timestamp": msg.timestamp,
-                    "tokens_used": msg.tokens_used
-                }
-                for msg in chat.messages
-            ]
-        }
+        # Serialize the dataclasses directly instead of building dict copies
+        self._write_atomic(chat_file, json_dumps_bytes(chat, indent=True))
         
-        with open(chat_file, 'w', encoding='utf-8') as f:
-            json.dump(chat_data, f, indent=2, ensure_ascii=False)
+        # Saving is an explicit checkpoint, so make the index durable; the
+        # chat file is ordered before it by the rename.
+        index = self._load_index()
+        index[chat.id] = self._chat_metadata(vars(chat))
+        self._write_index(sync=True)
+        
+        # The snapshot now holds every message, so the journal can go
+        if self._journal_chat_id == chat.id:
+            self._close_journal()
+        self._journal_path(chat.id).unlink(missing_ok=True)
     
     def load_chat(self, chat_id: str) -> Optional[ChatSession]:
         """Load a chat session from disk."""
@@ -97,8 +104,8 @@ class ChatManager:
             return None
         
         try:
-            with open(chat_file, 'r', encoding='utf-8') as f:
-                chat_data = json.load(f)
+            with open(chat_file, 'rb') as f:
+                chat_data = json_loads(f.read())
             
             messages = [
                 ChatMessage(
@@ -109,14 +116,22 @@ class ChatManager:
                 )
                 for msg in chat_data["messages"]
             ]
+            total_tokens = chat_data.get("total_tokens", 0)
+            last_modified = chat_data["last_modified"]
+            
+            # Replay messages added after the last save
+            for message in self._read_journal(chat_id, len(messages)):
+                messages.append(message)
+                total_tokens += message.tokens_used
+                last_modified = message.timestamp
             
             chat = ChatSession(
                 id=chat_data["id"],
                 title=chat_data["title"],
                 created_at=chat_data["created_at"],
-                last_modified=chat_data["last_modified"],
+                last_modified=last_modified,
                 messages=messages,
-                total_tokens=chat_data.get("total_tokens", 0)
+                total_tokens=total_tokens
             )
             
             self.current_chat = chat
@@ -128,27 +143,108 @@ class ChatManager:
     
     def list_chats(self) -> List[Dict[str, Any]]:
         """List all available chat sessions."""
+        index = self._load_index()
+        
+        with os.scandir(self.chats_dir) as entries:
+            names = {entry.name for entry in entries if entry.is_file()}
+        
+        # Another session or the user may have added or removed chat files
+        chat_ids = {
+            name[:-len('.json')] for name in names
+            if name.endswith('.json') and name != self.INDEX_FILENAME
+        }
+        if chat_ids != index.keys():
+            index = self._index = self._rebuild_index()
+            self._write_index()
+        
         chats = []
+        for chat_id, metadata in index.items():
+            metadata = dict(metadata)
+            if f"{chat_id}{self.JOURNAL_SUFFIX}" in names:
+                journal = self._read_journal(chat_id, metadata["message_count"])
+                if journal:
+                    self._add_to_metadata(metadata, journal)
+            chats.append(metadata)
         
-        for chat_file in self.chats_dir.glob("*.json"):
+        # Sort by last modified (newest first)
+        chats.sort(key=lambda x: x["last_modified"], reverse=True)
+        return chats
+    
+    def _chat_metadata(self, chat_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the listing metadata from serialized chat data."""
+        return {
+            "id": chat_data["id"],
+            "title": chat_data["title"],
+            "created_at": chat_data["created_at"],
+            "last_modified": chat_data["last_modified"],
+            "message_count": len(chat_data["messages"]),
+            "total_tokens": chat_data.get("total_tokens", 0)
+        }
+    
+    @staticmethod
+    def _add_to_metadata(metadata: Dict[str, Any], messages: List[ChatMessage]) -> None:
+        """Count messages added after the chat's last save in its listing metadata."""
+        metadata["message_count"] += len(messages)
+        metadata["total_tokens"] += sum(message.tokens_used for message in messages)
+        metadata["last_modified"] = messages[-1].timestamp
+    
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the chat index, rebuilding it from the chat files if it is missing.
+        
+        Other sessions write the index too, so the cached copy is only reused
+        while the file on disk is unchanged.
+        """
+        try:
+            stat = os.stat(self.index_file)
+            index_stat = (stat.st_mtime_ns, stat.st_size)
+            if self._index is not None and index_stat == self._index_stat:
+                return self._index
+            
+            with open(self.index_file, 'rb') as f:
+                self._index = json_loads(f.read())
+            self._index_stat = index_stat
+        except (OSError, ValueError):
+            self._index = self._rebuild_index()
+            self._write_index()
+        
+        return self._index
+    
+    def _rebuild_index(self) -> Dict[str, Dict[str, Any]]:
+        """Build the chat index by scanning every saved chat file."""
+        index = {}
+        
+        with os.scandir(self.chats_dir) as entries:
+            chat_files = [
+                entry.path for entry in entries
+                if entry.name.endswith('.json') and entry.name != self.INDEX_FILENAME and entry.is_file()
+            ]
+        
+        for chat_file in chat_files:
             try:
-                with open(chat_file, 'r', encoding='utf-8') as f:
-                    chat_data = json.load(f)
+                with open(chat_file, 'rb') as f:
+                    chat_data = json_loads(f.read())
                 
-                chats.append({
-                    "id": chat_data["id"],
-                    "title": chat_data["title"],
-                    "created_at": chat_data["created_at"],
-                    "last_modified": chat_data["last_modified"],
-                    "message_count": len(chat_data["messages"]),
-                    "total_tokens": chat_data.get("total_tokens", 0)
-                })
+                index[chat_data["id"]] = self._chat_metadata(chat_data)
             except (json.JSONDecodeError, KeyError):
                 continue
         
-        # Sort by last modified (newest first)
-        chats.sort(key=lambda x: x["last_modified"], reverse=True)
-        return chats
+        return index
+    
+    def _write_index(self, sync: bool = False) -> None:
+        """Atomically write the chat index to disk."""
+        self._write_atomic(self.index_file, json_dumps_bytes(self._index, indent=True), sync=sync)
+        stat = os.stat(self.index_file)
+        self._index_stat = (stat.st_mtime_ns, stat.st_size)
+    
+    def _write_atomic(self, path: Path, data: bytes, sync: bool = False) -> None:
+        """Write data to a temp file and rename it over path, optionally fsyncing first."""
+        temp_file = path.with_suffix('.json.tmp')
+        with open(temp_file, 'wb') as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_file, path)
     
     def delete_chat(self, chat_id: str) -> bool:
         """Delete a chat session."""
@@ -157,6 +253,14 @@ class ChatManager:
         if chat_file.exists():
             chat_file.unlink()
             
+            if self._journal_chat_id == chat_id:
+                self._close_journal()
+            self._journal_path(chat_id).unlink(missing_ok=True)
+            
+            index = self._load_index()
+            if index.pop(chat_id, None) is not None:
+                self._write_index()
+            
             # If this was the current chat, clear it
             if self.current_chat and self.current_chat.id == chat_id:
                 self.current_chat = None
@@ -167,18 +271,91 @@ class ChatManager:
     
     def add_message(self, role: str, content: str, tokens_used: int = 0) -> None:
         """Add a message to the current chat."""
-        if self.current_chat is None:
-            self.create_new_chat()
-        
-        message = ChatMessage(
+        self.add_messages([self.make_message(role, content, tokens_used)])
+    
+    @staticmethod
+    def make_message(role: str, content: str, tokens_used: int = 0) -> ChatMessage:
+        """Create a message stamped with the current time, to be added later."""
+        return ChatMessage(
             role=role,
             content=content,
             timestamp=datetime.now().isoformat(),
             tokens_used=tokens_used
         )
+    
+    def add_messages(self, messages: Iterable[ChatMessage]) -> None:
+        """Add several messages to the current chat with a single journal write."""
+        messages = list(messages)
+        if not messages:
+            return
+        
+        if self.current_chat is None:
+            self.create_new_chat()
         
-        self.current_chat.messages.append(message)
-        self.current_chat.total_tokens += tokens_used
+        chat = self.current_chat
+        start = len(chat.messages)
+        chat.messages.extend(messages)
+        chat.total_tokens += sum(message.tokens_used for message in messages)
+        self._append_to_journal(chat, start, messages)
+    
+    def _journal_path(self, chat_id: str) -> Path:
+        """Get the path of a chat's message journal."""
+        return self.chats_dir / f"{chat_id}{self.JOURNAL_SUFFIX}"
+    
+    def _append_to_journal(self, chat: ChatSession, start: int, messages: List[ChatMessage]) -> None:
+        """Append messages starting at index start to the chat's journal, if the chat has been saved."""
+        if self._journal_chat_id != chat.id:
+            self._close_journal()
+            # Unsaved chats have no snapshot to replay onto
+            if not (self.chats_dir / f"{chat.id}.json").exists():
+                return
+            
+            flags = os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+            fd = os.open(self._journal_path(chat.id), flags, 0o644)
+            
+            # Terminate a line torn by a crash so new entries stay parseable
+            size = os.lseek(fd, 0, os.SEEK_END)
+            if size:
+                os.lseek(fd, size - 1, os.SEEK_SET)
+                if os.read(fd, 1) != b"\n":
+                    os.write(fd, b"\n")
+            
+            self._journal_fd = fd
+            self._journal_chat_id = chat.id
+        
+        # The position lets replay skip entries already in the snapshot
+        data = b"".join(
+            json_dumps_bytes({"index": index, "message": message}) + b"\n"
+            for index, message in enumerate(messages, start)
+        )
+        os.write(self._journal_fd, data)
+    
+    def _read_journal(self, chat_id: str, message_count: int) -> List[ChatMessage]:
+        """Read journaled messages that follow the first message_count messages."""
+        try:
+            with open(self._journal_path(chat_id), 'rb') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return []
+        
+        messages = []
+        for line in lines:
+            try:
+                entry = json_loads(line)
+                if entry["index"] != message_count + len(messages):
+                    continue
+                messages.append(ChatMessage(**entry["message"]))
+            except (ValueError, KeyError, TypeError):
+                # A line torn by a crash mid-write
+                continue
+        return messages
+    
+    def _close_journal(self) -> None:
+        """Close the open journal, if any."""
+        if self._journal_fd is not None:
+            os.close(self._journal_fd)
+        self._journal_fd = None
+        self._journal_chat_id = None
     
     def get_current_chat(self) -> Optional[ChatSession]:
         """Get the current chat session."""
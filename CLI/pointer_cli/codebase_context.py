@@ -3,15 +3,22 @@ Codebase context analysis for Pointer CLI.
 """
 
 import os
+import re
 import json
 import time
+import heapq
+from collections import Counter
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Tuple, Union, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 import fnmatch
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from .config import Config
-from .utils import safe_read_file, get_file_info
+from .utils import is_text_file, format_file_size, get_project_root
+
+# Well-known project entry points ranked highly among key files
+_ENTRY_POINT_FILES = frozenset({'main.py', 'app.py', 'index.js', 'package.json', 'requirements.txt'})
 
 @dataclass
 class CodebaseFile:
@@ -24,34 +31,66 @@ class CodebaseFile:
     size_formatted: str
     modified: float
     is_text: bool
-    content_preview: str
-    lines: int
+    # Preview fields stay None until the file's content is loaded
+    content_preview: Optional[str] = None
+    lines: Optional[int] = None
+    # Lowercased copies for search_context, computed once on ingest
+    name_lc: str = field(init=False, repr=False)
+    path_lc: str = field(init=False, repr=False)
+    preview_lc: Optional[str] = field(default=None, init=False, repr=False)
+    
+    def __post_init__(self):
+        self.name_lc = self.name.lower()
+        self.path_lc = self.relative_path.lower()
+        if self.content_preview is not None:
+            self.preview_lc = self.content_preview.lower()
+    
+    def set_content(self, content: str) -> None:
+        """Fill in the preview fields from the file's content."""
+        self.content_preview = content[:500] if content else ""  # First 500 chars
+        self.lines = content.count('\n') + 1 if content else 0
+        self.preview_lc = self.content_preview.lower()
 
 class CodebaseContext:
     """Manages codebase context for AI prompts."""
     
+    READ_WORKERS = 8
+    MAX_READ_BYTES = 10 * 1024
+    SNIFF_BYTES = 512
+    
     def __init__(self, config: Config):
         self.config = config
         self.context_cache = {}
         self.last_refresh = 0
+        # Snapshots of config.codebase taken once per refresh for the scan loop
+        self._max_depth = 0
+        self._allowed_extensions: frozenset = frozenset()
+        self._exclude_re: Optional[re.Pattern] = None
+        self._exclude_substrings: Optional[tuple] = None
+        # Per-extension counts and per-directory [files, size] totals,
+        # maintained as files are added so summaries skip a full cache pass
+        self._ext_counts: Counter = Counter()
+        self._dir_agg: Dict[str, List[int]] = {}
+        self._derived: Dict[str, Any] = {}
+        self._derived_version = None
         self.project_root = None
         self._initialize_project_root()
     
     def _initialize_project_root(self) -> None:
         """Initialize the project root directory."""
-        from .utils import get_project_root
         self.project_root = get_project_root()
     
     def should_refresh_context(self) -> bool:
         """Check if context should be refreshed."""
-        if not self.config.codebase.include_context:
+        codebase = self.config.codebase
+        if not codebase.include_context:
             return False
         
-        if self.config.codebase.auto_refresh_context:
+        if codebase.auto_refresh_context:
             return True
         
         current_time = time.time()
-        return (current_time - self.last_refresh) > self.config.codebase.context_cache_duration
+        return (current_time - self.last_refresh) > codebase.context_cache_duration
     
     def get_context_summary(self) -> Dict[str, Any]:
         """Get a summary of the codebase context."""
@@ -61,12 +100,14 @@ class CodebaseContext:
         if self.should_refresh_context():
             self._refresh_context()
         
+        key_files = self._load_key_files(self.config.codebase.max_context_files)
+        
         return {
             "project_root": str(self.project_root) if self.project_root else None,
             "total_files": len(self.context_cache),
             "file_types": self._get_file_type_summary(),
             "structure": self._get_structure_summary(),
-            "key_files": self._get_key_files(),
+            "key_files": key_files,
             "last_updated": self.last_refresh
         }
     
@@ -78,9 +119,13 @@ class CodebaseContext:
         if self.should_refresh_context():
             self._refresh_context()
         
+        # Read the key files first: binary ones found by the read leave the counts below
+        key_files = self._load_key_files(self.config.codebase.max_context_files)
+        
         if not self.context_cache:
             return "No codebase context available."
         
+        # Every line goes into one list that is joined once at the end
         context_parts = [
             "Codebase Context:",
             f"Project Root: {self.project_root}",
@@ -91,23 +136,24 @@ class CodebaseContext:
         
         # Add directory structure
         structure = self._get_structure_summary()
+        append = context_parts.append
         for path, info in structure.items():
-            context_parts.append(f"  {path}/ ({info['files']} files, {info['size_formatted']})")
+            append(f"  {path}/ ({info['files']} files, {info['size_formatted']})")
         
-        context_parts.append("")
-        context_parts.append("Key Files:")
+        append("")
+        append("Key Files:")
         
         # Add key files with previews
-        key_files = self._get_key_files()
-        for file_info in key_files[:self.config.codebase.max_context_files]:
-            context_parts.append(f"  {file_info.relative_path}")
+        for file_info in key_files:
+            append(f"  {file_info.relative_path}")
             if file_info.content_preview:
-                preview_lines = file_info.content_preview.split('\n')[:5]
-                preview_text = '\n'.join(f"    {line}" for line in preview_lines)
-                if len(file_info.content_preview.split('\n')) > 5:
-                    preview_text += "\n    ..."
-                context_parts.append(preview_text)
-            context_parts.append("")
+                # At most six pieces: a sixth only exists if there are more lines
+                preview_lines = file_info.content_preview.split('\n', 5)
+                for line in preview_lines[:5]:
+                    append("    " + line)
+                if len(preview_lines) > 5:
+                    append("    ...")
+            append("")
         
         return "\n".join(context_parts)
     
@@ -117,107 +163,223 @@ class CodebaseContext:
             return
         
         self.context_cache.clear()
-        self._scan_directory(self.project_root, depth=0)
+        self._ext_counts.clear()
+        self._dir_agg.clear()
+        codebase = self.config.codebase
+        self._max_depth = codebase.context_depth
+        self._allowed_extensions = frozenset(ext.lower() for ext in codebase.context_file_types)
+        self._compile_exclude_patterns()
+        candidates: List[Tuple[Path, os.stat_result]] = []
+        self._scan_directory(self.project_root, 0, candidates)
+        self._record_files(candidates)
         self.last_refresh = time.time()
     
-    def _scan_directory(self, directory: Path, depth: int) -> None:
-        """Recursively scan directory for relevant files."""
-        if depth > self.config.codebase.context_depth:
+    def _scan_directory(self, directory: Union[Path, str], depth: int,
+                        candidates: List[Tuple[Path, os.stat_result]]) -> None:
+        """Recursively scan directory, collecting relevant files and their stats."""
+        max_depth = self._max_depth
+        allowed_extensions = self._allowed_extensions
+        should_exclude = self._should_exclude
+        if depth > max_depth:
             return
         
         try:
-            for item in directory.iterdir():
-                # Skip excluded patterns
-                if self._should_exclude(item):
-                    continue
-                
-                if item.is_file():
-                    self._add_file_to_context(item)
-                elif item.is_dir() and depth < self.config.codebase.context_depth:
-                    self._scan_directory(item, depth + 1)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Skip excluded patterns
+                    if should_exclude(entry.path):
+                        continue
+                    
+                    try:
+                        if entry.is_file():
+                            # Check the file type before paying for a stat call
+                            if os.path.splitext(entry.name)[1].lower() not in allowed_extensions:
+                                continue
+                            candidates.append((Path(entry.path), entry.stat()))
+                        elif entry.is_dir() and depth < max_depth:
+                            self._scan_directory(entry.path, depth + 1, candidates)
+                    except OSError:
+                        # Skip entries that vanished or can't be stat'ed
+                        continue
         except PermissionError:
             # Skip directories we can't access
             pass
     
-    def _should_exclude(self, path: Path) -> bool:
+    def _compile_exclude_patterns(self) -> None:
+        """Compile exclude patterns into one regex plus a tuple of plain substrings."""
+        patterns = self.config.codebase.exclude_patterns
+        
+        # Same normalization fnmatch.fnmatch applies, so matching stays identical per platform
+        translated = '|'.join(f'(?:{fnmatch.translate(os.path.normcase(p))})' for p in patterns)
+        self._exclude_re = re.compile(translated) if translated else None
+        self._exclude_substrings = tuple(p for p in patterns if not any(c in p for c in '*?['))
+    
+    def _should_exclude(self, path: Union[Path, str]) -> bool:
         """Check if a path should be excluded from context."""
+        if self._exclude_substrings is None:
+            self._compile_exclude_patterns()
+        
         path_str = str(path)
         
-        for pattern in self.config.codebase.exclude_patterns:
-            if fnmatch.fnmatch(path_str, pattern) or pattern in path_str:
-                return True
+        if any(substring in path_str for substring in self._exclude_substrings):
+            return True
+        
+        return bool(self._exclude_re and self._exclude_re.match(os.path.normcase(path_str)))
+    
+    def _record_files(self, candidates: List[Tuple[Path, os.stat_result]]) -> None:
+        """Add candidate files to the context cache from their stats alone."""
+        for path, stat_result in candidates:
+            # Extensionless files are sniffed here; the rest are judged by extension
+            if is_text_file(path):
+                self._add_file_to_context(path, stat_result)
+    
+    def _load_key_files(self, limit: int) -> List[CodebaseFile]:
+        """Return the top key files with their previews loaded."""
+        # Evicting a binary file can promote another one into the list
+        while True:
+            key_files = self._get_key_files()[:limit]
+            if not self._load_previews(key_files):
+                return key_files
+    
+    def _load_previews(self, files: Iterable[CodebaseFile]) -> bool:
+        """Read content previews for the given files that don't have one yet.
+        
+        Files that turn out to be binary, or that vanished since the scan, are
+        evicted from the cache. Returns True if any were.
+        """
+        pending = [file_info for file_info in files if file_info.content_preview is None]
+        if not pending:
+            return False
+        
+        # File reads are I/O bound, so threads overlap the waits; results are
+        # applied on this thread.
+        workers = min(self.READ_WORKERS, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            contents = executor.map(self._read_file, (file_info.path for file_info in pending),
+                                    (file_info.size for file_info in pending))
+            evicted = False
+            for file_info, content in zip(pending, contents):
+                if content is None:
+                    self._evict_file(file_info)
+                    evicted = True
+                else:
+                    file_info.set_content(content)
         
-        return False
+        return evicted
     
-    def _add_file_to_context(self, file_path: Path) -> None:
-        """Add a file to the context cache."""
+    def _read_file(self, file_path: Path, size: int) -> Optional[str]:
+        """Read a file for the context cache in one pass, or None if it is binary or gone."""
+        if size > self.MAX_READ_BYTES:
+            return f"[File too large: {format_file_size(size)}]"
+        
+        try:
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            return f"[Error reading file: {e}]"
+        
+        try:
+            # Sniff the head for NUL bytes before reading the rest
+            data = os.read(fd, self.SNIFF_BYTES)
+            if b'\0' in data:
+                return None
+            if len(data) == self.SNIFF_BYTES:
+                data += os.read(fd, self.MAX_READ_BYTES - len(data))
+            # Same newline translation as reading the file in text mode
+            return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        except (OSError, UnicodeDecodeError) as e:
+            return f"[Error reading file: {e}]"
+        finally:
+            os.close(fd)
+    
+    def _add_file_to_context(self, file_path: Path, stat_result: os.stat_result) -> None:
+        """Add a file to the context cache using the stat result from the directory scan."""
         try:
-            # Check if file type is included
-            if file_path.suffix.lower() not in self.config.codebase.context_file_types:
-                return
-            
-            # Get file info
-            file_info = get_file_info(file_path)
-            if not file_info.get('is_text', False):
-                return
-            
             # Get relative path
             relative_path = file_path.relative_to(self.project_root) if self.project_root else str(file_path)
             
-            # Read file content preview
-            content = safe_read_file(file_path, max_size=1024 * 10)  # 10KB max
-            content_preview = content[:500] if content else ""  # First 500 chars
-            
             # Create codebase file object
             codebase_file = CodebaseFile(
                 path=file_path,
                 relative_path=str(relative_path),
                 name=file_path.name,
                 extension=file_path.suffix.lower(),
-                size=file_info.get('size', 0),
-                size_formatted=file_info.get('size_formatted', '0B'),
-                modified=file_info.get('modified', 0),
-                is_text=file_info.get('is_text', False),
-                content_preview=content_preview,
-                lines=len(content.split('\n')) if content else 0
+                size=stat_result.st_size,
+                size_formatted=format_file_size(stat_result.st_size),
+                modified=stat_result.st_mtime,
+                is_text=True
             )
             
-            self.context_cache[str(relative_path)] = codebase_file
+            self.context_cache[codebase_file.relative_path] = codebase_file
+            
+            self._ext_counts[codebase_file.extension] += 1
+            dir_path, sep, _ = codebase_file.relative_path.rpartition('/')
+            if sep:
+                agg = self._dir_agg.setdefault(dir_path, [0, 0])
+                agg[0] += 1
+                agg[1] += codebase_file.size
             
         except Exception:
             # Skip files we can't process
             pass
     
+    def _evict_file(self, file_info: CodebaseFile) -> None:
+        """Remove a file from the cache and from the totals kept during the scan."""
+        if self.context_cache.pop(file_info.relative_path, None) is None:
+            return
+        
+        self._ext_counts[file_info.extension] -= 1
+        if not self._ext_counts[file_info.extension]:
+            del self._ext_counts[file_info.extension]
+        
+        dir_path, sep, _ = file_info.relative_path.rpartition('/')
+        agg = self._dir_agg.get(dir_path) if sep else None
+        if agg:
+            agg[0] -= 1
+            agg[1] -= file_info.size
+            if not agg[0]:
+                del self._dir_agg[dir_path]
+        
+        # Summaries built from the old totals are stale
+        self._derived = {}
+    
+    def _get_derived(self, key: str, builder: Callable[[], Any]) -> Any:
+        """Get a summary derived from the cache, rebuilding it only after a refresh."""
+        if self._derived_version != self.last_refresh:
+            self._derived = {}
+            self._derived_version = self.last_refresh
+        
+        if key not in self._derived:
+            self._derived[key] = builder()
+        return self._derived[key]
+    
     def _get_file_type_summary(self) -> Dict[str, int]:
         """Get summary of file types in the codebase."""
-        type_counts = {}
-        for file_info in self.context_cache.values():
-            ext = file_info.extension
-            type_counts[ext] = type_counts.get(ext, 0) + 1
-        return type_counts
+        return self._get_derived("file_types", self._build_file_type_summary)
+    
+    def _build_file_type_summary(self) -> Dict[str, int]:
+        """Copy the per-extension counts kept during the scan."""
+        return dict(self._ext_counts)
     
     def _get_structure_summary(self) -> Dict[str, Dict[str, Any]]:
         """Get summary of directory structure."""
-        structure = {}
-        
-        for file_info in self.context_cache.values():
-            path_parts = file_info.relative_path.split('/')
-            if len(path_parts) > 1:
-                dir_path = '/'.join(path_parts[:-1])
-                if dir_path not in structure:
-                    structure[dir_path] = {'files': 0, 'size': 0}
-                structure[dir_path]['files'] += 1
-                structure[dir_path]['size'] += file_info.size
-        
-        # Format sizes
-        for dir_info in structure.values():
-            dir_info['size_formatted'] = self._format_size(dir_info['size'])
-        
-        return structure
+        return self._get_derived("structure", self._build_structure_summary)
+    
+    def _build_structure_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Materialize the per-directory totals kept during the scan."""
+        return {
+            dir_path: {'files': files, 'size': size, 'size_formatted': self._format_size(size)}
+            for dir_path, (files, size) in self._dir_agg.items()
+        }
     
     def _get_key_files(self) -> List[CodebaseFile]:
         """Get key files for context (sorted by importance)."""
-        files = list(self.context_cache.values())
+        return self._get_derived("key_files", self._build_key_files)
+    
+    def _build_key_files(self) -> List[CodebaseFile]:
+        """Rank cached files by importance, keeping only as many as the prompt uses."""
+        now = time.time()
         
         # Sort by importance (README, main files, larger files, etc.)
         def file_importance(file_info: CodebaseFile) -> int:
@@ -228,37 +390,40 @@ class CodebaseContext:
                 importance += 1000
             
             # Main entry points are important
-            if file_info.name in ['main.py', 'app.py', 'index.js', 'package.json', 'requirements.txt']:
+            if file_info.name in _ENTRY_POINT_FILES:
                 importance += 500
             
             # Larger files might be more important
             importance += min(file_info.size // 100, 100)
             
             # More recent files might be more important
-            importance += min(int(time.time() - file_info.modified) // 86400, 50)
+            importance += min(int(now - file_info.modified) // 86400, 50)
             
             return importance
         
-        files.sort(key=file_importance, reverse=True)
-        return files
+        # Equivalent to a full descending sort truncated to max_context_files
+        return heapq.nlargest(self.config.codebase.max_context_files, self.context_cache.values(), key=file_importance)
     
     def _format_size(self, size_bytes: int) -> str:
         """Format file size in human readable format."""
-        if size_bytes == 0:
-            return "0B"
-        
-        size_names = ["B", "KB", "MB", "GB", "TB"]
-        i = 0
-        while size_bytes >= 1024 and i < len(size_names) - 1:
-            size_bytes /= 1024.0
-            i += 1
-        
-        return f"{size_bytes:.1f}{size_names[i]}"
+        return format_file_size(size_bytes)
     
     def force_refresh(self) -> None:
         """Force a refresh of the context cache."""
         self._refresh_context()
     
+    def set_project_root(self, project_root: Optional[Path]) -> None:
+        """Switch to another project root, dropping everything cached from the old one."""
+        if project_root == self.project_root:
+            return
+        
+        self.project_root = project_root
+        self.context_cache.clear()
+        self._ext_counts.clear()
+        self._dir_agg.clear()
+        self._derived = {}
+        self.last_refresh = 0
+    
     def get_file_context(self, file_path: str) -> Optional[CodebaseFile]:
         """Get context for a specific file."""
         if not self.config.codebase.include_context:
@@ -267,6 +432,10 @@ class CodebaseContext:
         if self.should_refresh_context():
             self._refresh_context()
         
+        file_info = self.context_cache.get(file_path)
+        if file_info:
+            self._load_previews((file_info,))
+        # The read evicts binary files
         return self.context_cache.get(file_path)
     
     def search_context(self, query: str) -> List[CodebaseFile]:
@@ -277,14 +446,16 @@ class CodebaseContext:
         if self.should_refresh_context():
             self._refresh_context()
         
-        results = []
         query_lower = query.lower()
         
-        for file_info in self.context_cache.values():
-            # Search in filename, path, and content
-            if (query_lower in file_info.name.lower() or
-                query_lower in file_info.relative_path.lower() or
-                query_lower in file_info.content_preview.lower()):
-                results.append(file_info)
+        # Only files whose path doesn't already match need their content
+        self._load_previews(file_info for file_info in self.context_cache.values()
+                            if query_lower not in file_info.path_lc)
         
-        return results
+        # Search in filename, path, and content (cheapest first)
+        return [
+            file_info for file_info in self.context_cache.values()
+            if (query_lower in file_info.name_lc or
+                query_lower in file_info.path_lc or
+                query_lower in file_info.preview_lc)
+        ]
@@ -2,12 +2,47 @@
 Configuration management for Pointer CLI.
 """
 
-import json
 import os
+import atexit
+import functools
+import threading
+import weakref
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, ClassVar
 from dataclasses import dataclass, asdict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+@functools.lru_cache(maxsize=1)
+def _default_config_path() -> Path:
+    """Resolve the default config file path once per process."""
+    return Path.home() / ".pointer-cli" / "config.json"
+
+class _SaveState:
+    """Pending-save bookkeeping for one Config; copies start with nothing pending."""
+    
+    __slots__ = ("lock", "timer", "dirty")
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timer: Optional[threading.Timer] = None
+        self.dirty = False
+    
+    def __copy__(self) -> "_SaveState":
+        return _SaveState()
+    
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "_SaveState":
+        return _SaveState()
+
+# Configs with a save pending, by id since models are unhashable. Weak values
+# let a Config be collected; one atexit hook flushes whatever is left.
+_pending_saves: "weakref.WeakValueDictionary[int, Config]" = weakref.WeakValueDictionary()
+
+def _flush_pending_saves() -> None:
+    """Write every pending config save; run once at interpreter exit."""
+    for config in list(_pending_saves.values()):
+        config.flush()
+
+atexit.register(_flush_pending_saves)
 
 class APIConfig(BaseModel):
     """API configuration settings."""
@@ -49,6 +84,12 @@ class Config(BaseModel):
     codebase: CodebaseConfig = Field(default_factory=CodebaseConfig)
     initialized: bool = Field(default=False, description="Whether config is initialized")
     
+    # Setters coalesce their writes to the default config file within this window
+    SAVE_DELAY: ClassVar[float] = 0.25
+    
+    _save_state: _SaveState = PrivateAttr(default_factory=_SaveState)
+    _version: int = PrivateAttr(default=0)
+    
     model_config = {
         "json_encoders": {
             Path: str,
@@ -65,10 +106,8 @@ class Config(BaseModel):
         
         if config_file.exists():
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return cls(**data)
-            except (json.JSONDecodeError, ValueError) as e:
+                return cls.model_validate_json(config_file.read_bytes())
+            except ValueError as e:
                 print(f"Warning: Invalid config file {config_file}: {e}")
                 return cls()
         
@@ -84,14 +123,50 @@ class Config(BaseModel):
         # Ensure directory exists
         config_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(self.model_dump(), f, indent=2, ensure_ascii=False)
+        # Write to a temp file and rename so a crash never truncates the config
+        temp_file = config_file.with_suffix(config_file.suffix + '.tmp')
+        temp_file.write_bytes(self.model_dump_json(indent=2).encode('utf-8'))
+        os.replace(temp_file, config_file)
+    
+    def request_save(self) -> None:
+        """Schedule a save to the default config file, coalescing repeated requests."""
+        state = self._save_state
+        with state.lock:
+            # Every setting change goes through here, so it also marks a new version
+            self._version += 1
+            state.dirty = True
+            if state.timer is not None:
+                return
+            
+            _pending_saves[id(self)] = self
+            state.timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            state.timer.daemon = True
+            state.timer.start()
+    
+    def flush(self) -> None:
+        """Write any pending save to the default config file immediately."""
+        state = self._save_state
+        with state.lock:
+            if state.timer is not None:
+                state.timer.cancel()
+                state.timer = None
+            _pending_saves.pop(id(self), None)
+            
+            if not state.dirty:
+                return
+            
+            state.dirty = False
+            self.save()
+    
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever a setting is changed, for caching derived views."""
+        return self._version
     
     @classmethod
     def get_default_config_path(cls) -> Path:
         """Get the default configuration file path."""
-        config_dir = Path.home() / ".pointer-cli"
-        return config_dir / "config.json"
+        return _default_config_path()
     
     def is_initialized(self) -> bool:
         """Check if configuration is initialized."""
@@ -113,33 +188,33 @@ class Config(BaseModel):
         self.initialized = True
         
         # Save the configuration
-        self.save()
+        self.request_save()
     
     def update_api_config(self, **kwargs) -> None:
         """Update API configuration."""
         for key, value in kwargs.items():
             if hasattr(self.api, key):
                 setattr(self.api, key, value)
-        self.save()
+        self.request_save()
     
     def update_ui_config(self, **kwargs) -> None:
         """Update UI configuration."""
         for key, value in kwargs.items():
             if hasattr(self.ui, key):
                 setattr(self.ui, key, value)
-        self.save()
+        self.request_save()
     
     def update_mode_config(self, **kwargs) -> None:
         """Update mode configuration."""
         for key, value in kwargs.items():
             if hasattr(self.mode, key):
                 setattr(self.mode, key, value)
-        self.save()
+        self.request_save()
     
     def toggle_auto_run_mode(self) -> bool:
         """Toggle auto-run mode."""
         self.mode.auto_run_mode = not self.mode.auto_run_mode
-        self.save()
+        self.request_save()
         return self.mode.auto_run_mode
     
 
@@ -147,11 +222,11 @@ class Config(BaseModel):
     def toggle_ai_responses(self) -> bool:
         """Toggle AI response display."""
         self.ui.show_ai_responses = not self.ui.show_ai_responses
-        self.save()
+        self.request_save()
         return self.ui.show_ai_responses
     
     def toggle_thinking(self) -> bool:
         """Toggle AI thinking display."""
         self.ui.show_thinking = not self.ui.show_thinking
-        self.save()
+        self.request_save()
         return self.ui.show_thinking
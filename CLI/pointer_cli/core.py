@@ -3,22 +3,130 @@ Core Pointer CLI implementation.
 """
 
 import asyncio
+import functools
+import re
+import signal
 import sys
-from typing import Optional, Dict, Any, List
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Iterator, Tuple
 from pathlib import Path
 
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
 from rich.panel import Panel
 from rich.text import Text
-from rich.prompt import Prompt
+from rich.markup import escape
+from rich.prompt import Confirm, Prompt
 
 from .config import Config
 from .chat import ChatInterface
 from .tools import ToolManager
 from .modes import ModeManager
-from .utils import get_project_root, is_git_repo
+from .utils import get_project_root
 from .chat_manager import ChatManager
 
+# <think>...</think> blocks in AI responses
+_THINK_RE = re.compile(r'<think>(.*?)</think>', re.DOTALL)
+
+@functools.lru_cache(maxsize=1)
+def _build_help_panel() -> Panel:
+    """Build the static /help panel once."""
+    help_text = Text()
+    help_text.append("Pointer CLI Commands:\n\n", style="bold")
+    
+    help_text.append("/help", style="bold blue")
+    help_text.append(" - Show this help message\n")
+    
+    help_text.append("/config", style="bold blue")
+    help_text.append(" - Show current configuration\n")
+    
+    help_text.append("/mode", style="bold blue")
+    help_text.append(" - Toggle between auto-run and manual mode\n")
+    
+    help_text.append("/status", style="bold blue")
+    help_text.append(" - Show current status and context\n")
+    
+    help_text.append("/info", style="bold blue")
+    help_text.append(" - Show session information and token usage\n")
+    
+    help_text.append("/chats", style="bold blue")
+    help_text.append(" - Chat management (new, load, save, list, delete, current)\n")
+    
+    help_text.append("/context", style="bold blue")
+    help_text.append(" - Codebase context management (refresh, enable, disable, show, search, config)\n")
+    
+    help_text.append("/clear", style="bold blue")
+    help_text.append(" - Clear the screen\n")
+    
+    help_text.append("/exit", style="bold blue")
+    help_text.append(" - Exit Pointer CLI\n\n")
+    
+    help_text.append("Natural Language:\n", style="bold")
+    help_text.append("You can interact with Pointer CLI using natural language.\n")
+    help_text.append("Ask questions, request file operations, or describe what you want to do.\n\n")
+    
+    help_text.append("Configuration Notes:\n", style="bold")
+    help_text.append("• /mode - Toggle between auto-run (immediate execution) and manual (confirmation required)\n")
+    help_text.append("• Show AI Responses: false = shows response box but hides content\n")
+    help_text.append("• AI follow-up after tool execution is always enabled\n")
+    help_text.append("• Show Thinking: only relevant when AI responses are enabled\n")
+    
+    return Panel(help_text, title="Help", border_style="green")
+
+@functools.lru_cache(maxsize=1)
+def _build_chat_help_panel() -> Panel:
+    """Build the static chat command help panel once."""
+    help_text = Text()
+    help_text.append("Chat Management Commands:\n\n", style="bold")
+    
+    help_text.append("/chats new [title]", style="bold blue")
+    help_text.append(" - Create a new chat session\n")
+    
+    help_text.append("/chats load <chat_id>", style="bold blue")
+    help_text.append(" - Load a saved chat session\n")
+    
+    help_text.append("/chats save", style="bold blue")
+    help_text.append(" - Save the current chat session\n")
+    
+    help_text.append("/chats list", style="bold blue")
+    help_text.append(" - List all saved chat sessions\n")
+    
+    help_text.append("/chats delete <chat_id>", style="bold blue")
+    help_text.append(" - Delete a saved chat session\n")
+    
+    help_text.append("/chats current", style="bold blue")
+    help_text.append(" - Show current chat information\n")
+    
+    return Panel(help_text, title="Chat Commands", border_style="blue")
+
+class SessionStats:
+    """Token and message counters for the current CLI session."""
+    
+    __slots__ = ("total_tokens", "prompt_tokens", "cached_tokens", "message_count", "session_start_time")
+    
+    def __init__(self) -> None:
+        self.total_tokens = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.message_count = 0
+        self.session_start_time: Optional[float] = None
+    
+    def add_usage(self, tokens: int, prompt_tokens: int, cached_tokens: int) -> None:
+        """Accumulate the usage reported for one API call."""
+        self.total_tokens += tokens or 0
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached_tokens
+    
+    @property
+    def avg_tokens(self) -> float:
+        """Average tokens used per user message."""
+        return self.total_tokens / self.message_count if self.message_count else 0.0
+    
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of prompt tokens the provider served from its prompt cache."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
 class PointerCLI:
     """Main Pointer CLI class."""
     
@@ -27,46 +135,71 @@ class PointerCLI:
         # Force Windows color system for better compatibility
         self.console = Console(color_system="windows", force_terminal=True)
         
-        # Test if colors are actually working
-        self.colors_working = self._test_colors()
+        # Colors are available whenever Rich settled on a color system; no test print needed
+        self.colors_working = self.console.color_system is not None
         
         self.chat_interface = ChatInterface(config, self.console)
         self.tool_manager = ToolManager(config, self.console)
         self.mode_manager = ModeManager(config, self.console)
         self.chat_manager = ChatManager(config.get_default_config_path().parent)
         
+        # The project root doesn't change during a session, so look it up once
+        self._resolve_project_root()
+        
+        # Slash command handlers; each takes the command's arguments
+        self._command_handlers = {
+            "help": lambda args: self._show_help(),
+            "config": lambda args: self._show_config(),
+            "exit": lambda args: self._stop_chat_loop(),
+            "clear": lambda args: self.console.clear(),
+            "status": lambda args: self._show_status(),
+            "info": lambda args: self._show_info(),
+            "chats": self._handle_chat_command,
+            "chat": self._handle_chat_command,
+            "mode": lambda args: self._toggle_mode(),
+            "context": self._handle_context_command,
+        }
+        
+        # /chats subcommand handlers, dispatched the same way
+        self._chat_handlers = {
+            "new": self._create_new_chat,
+            "load": self._load_chat,
+            "save": lambda args: self._save_chat(),
+            "list": lambda args: self._list_chats(),
+            "delete": self._delete_chat,
+            "current": lambda args: self._show_current_chat(),
+        }
+        
         # State
         self.running = False
         self.current_context = {}
-        self.first_message = True
+        # Replaced with a no-op once the first message has been shown
+        self._prepare_first_message = self._clear_for_first_message
         
         # Token tracking
-        self.total_tokens = 0
-        self.message_count = 0
-        self.session_start_time = None
-    
-    def _test_colors(self) -> bool:
-        """Test if colors are actually working in the current terminal."""
-        try:
-            # Try to print colored text and see if it works
-            test_text = "[green]Test[/green]"
-            self.console.print(test_text)
-            # If we get here without errors, colors might be working
-            return True
-        except Exception:
-            return False
+        self.stats = SessionStats()
+        
+        # Event loop kept across run() calls so the chat interface's HTTP
+        # session and its keep-alive connections stay usable
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         
+        # /config panel, rebuilt only when the config version or file presence changes
+        self._config_panel: Optional[Tuple[Tuple[int, bool], Panel]] = None
+    
+    def _resolve_project_root(self) -> None:
+        """Look up the project root and git status; reused until the next /context refresh."""
+        self._project_root = get_project_root()
+        self._is_git_repo = self._project_root is not None
+    
     def run(self) -> None:
         """Run the Pointer CLI."""
         self.running = True
         
         # Clear screen on startup
-        import os
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.console.clear()
         
         # Initialize session tracking
-        import time
-        self.session_start_time = time.time()
+        self.stats.session_start_time = time.time()
         
         # Show welcome message
         self._show_welcome()
@@ -75,51 +208,99 @@ class PointerCLI:
         self._initialize_context()
         
         # Start chat interface
+        loop = self._get_event_loop()
+        main_task = loop.create_task(self._run_chat_loop())
+        handles_interrupt = self._install_interrupt_handler(loop, main_task)
         try:
-            asyncio.run(self._run_chat_loop())
-        except KeyboardInterrupt:
-            self._handle_exit()
+            loop.run_until_complete(main_task)
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # Ctrl+C: cancelled by the loop's SIGINT handler, or raised directly on Windows
+            pass
         except Exception as e:
             self.console.print(f"[red]Unexpected error: {e}[/red]")
             sys.exit(1)
+        finally:
+            if handles_interrupt:
+                loop.remove_signal_handler(signal.SIGINT)
+        
+        # Both /exit and Ctrl+C end up here once the chat loop has stopped
+        loop.run_until_complete(self._shutdown())
+        self._handle_exit()
+    
+    def _install_interrupt_handler(self, loop: asyncio.AbstractEventLoop, main_task: "asyncio.Task[None]") -> bool:
+        """Turn Ctrl+C into a single cancellation of the chat loop where the platform allows it."""
+        try:
+            loop.add_signal_handler(signal.SIGINT, self._request_shutdown, main_task)
+        except (NotImplementedError, RuntimeError):
+            # Windows event loops have no signal handlers; KeyboardInterrupt is used there
+            return False
+        return True
+    
+    def _stop_chat_loop(self) -> None:
+        """Let the chat loop finish after the current command so run() can shut down."""
+        self.running = False
+    
+    def _request_shutdown(self, main_task: "asyncio.Task[None]") -> None:
+        """Stop the chat loop in response to SIGINT."""
+        self.running = False
+        main_task.cancel()
+    
+    async def _shutdown(self) -> None:
+        """Save the current chat and release network resources before exiting."""
+        try:
+            self.chat_manager.save_chat()
+        except Exception as e:
+            self.console.print(f"[red]Error saving chat: {e}[/red]")
+        await self.chat_interface.close()
+    
+    def _get_event_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the CLI's event loop, creating it on first use."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+        return self._loop
     
     def _show_welcome(self) -> None:
         """Show welcome message and status."""
-        welcome_text = Text()
-        welcome_text.append("Pointer CLI", style="bold blue")
-        welcome_text.append(" - AI-powered local codebase assistant\n\n")
-        
-        # Show current configuration
-        welcome_text.append("Configuration:\n", style="bold")
-        welcome_text.append(f"  API: {self.config.api.base_url}\n")
-        welcome_text.append(f"  Model: {self.config.api.model_name}\n")
-        welcome_text.append(f"  Mode: {'Auto-Run' if self.config.mode.auto_run_mode else 'Manual'}\n")
-        welcome_text.append(f"  Show AI Responses: {'Yes' if self.config.ui.show_ai_responses else 'No'}\n")
+        config = self.config
+        welcome_text = (
+            "[bold blue]Pointer CLI[/bold blue] - AI-powered local codebase assistant\n\n"
+            # Show current configuration
+            "[bold]Configuration:\n[/bold]"
+            f"  API: {escape(config.api.base_url)}\n"
+            f"  Model: {escape(config.api.model_name)}\n"
+            f"  Mode: {'Auto-Run' if config.mode.auto_run_mode else 'Manual'}\n"
+            f"  Show AI Responses: {'Yes' if config.ui.show_ai_responses else 'No'}\n"
+        )
         
         # Show project info
-        project_root = get_project_root()
+        project_root = self._project_root
         if project_root:
-            welcome_text.append(f"\nProject: {project_root.name}\n")
-            welcome_text.append(f"  Root: {project_root}\n")
-            welcome_text.append(f"  Git: {'Yes' if is_git_repo() else 'No'}\n")
+            welcome_text += (
+                f"\nProject: {escape(project_root.name)}\n"
+                f"  Root: {escape(str(project_root))}\n"
+                f"  Git: {'Yes' if self._is_git_repo else 'No'}\n"
+            )
         else:
-            welcome_text.append("\nNo git repository detected\n")
+            welcome_text += "\nNo git repository detected\n"
         
-        welcome_text.append("\nType your message or use commands:\n")
-        welcome_text.append("  /help - Show help\n", style="dim")
-        welcome_text.append("  /chats - Chat management\n", style="dim")
-        welcome_text.append("  /config - Show configuration\n", style="dim")
-        welcome_text.append("  /mode - Toggle auto-run mode\n", style="dim")
-        welcome_text.append("  /exit - Exit Pointer CLI\n", style="dim")
+        welcome_text += (
+            "\nType your message or use commands:\n"
+            "[dim]  /help - Show help\n"
+            "  /chats - Chat management\n"
+            "  /config - Show configuration\n"
+            "  /mode - Toggle auto-run mode\n"
+            "  /exit - Exit Pointer CLI\n[/dim]"
+        )
         
         self.console.print(Panel(welcome_text, title="Welcome", border_style="blue"))
     
     def _initialize_context(self) -> None:
         """Initialize the current context."""
         self.current_context = {
-            "project_root": get_project_root(),
+            "project_root": self._project_root,
             "current_directory": Path.cwd(),
-            "is_git_repo": is_git_repo(),
+            "is_git_repo": self._is_git_repo,
             "config": self.config,
         }
     
@@ -141,73 +322,67 @@ class PointerCLI:
                 # Process natural language input
                 await self._process_user_message(user_input)
                 
-            except KeyboardInterrupt:
-                break
             except Exception as e:
                 self.console.print(f"[red]Error: {e}[/red]")
     
     async def _handle_command(self, command: str) -> None:
         """Handle CLI commands."""
-        parts = command[1:].split()
-        cmd = parts[0].lower() if parts else ""
-        args = parts[1:] if len(parts) > 1 else []
-        
-        if cmd == "help":
-            self._show_help()
-        elif cmd == "config":
-            self._show_config()
-        elif cmd == "exit":
-            self._handle_exit()
-        elif cmd == "clear":
-            import os
-            os.system('cls' if os.name == 'nt' else 'clear')
-        elif cmd == "status":
-            self._show_status()
-        elif cmd == "info":
-            self._show_info()
-        elif cmd == "chats" or cmd == "chat":
-            self._handle_chat_command(args)
-        elif cmd == "mode":
-            new_mode = self.config.toggle_auto_run_mode()
-            mode_text = "Auto-Run" if new_mode else "Manual"
-            self.console.print(f"[green]Mode changed to: {mode_text}[/green]")
-        elif cmd == "context":
-            await self._handle_context_command(args)
-        else:
+        cmd_part, _, rest = command[1:].lstrip().partition(' ')
+        cmd = cmd_part.lower()
+        args = rest.split() if rest else []
+        
+        handler = self._command_handlers.get(cmd)
+        if handler is None:
             self.console.print(f"[yellow]Unknown command: {cmd}[/yellow]")
             self.console.print("Type /help for available commands.")
+            return
+        
+        result = handler(args)
+        if asyncio.iscoroutine(result):
+            await result
+    
+    def _toggle_mode(self) -> None:
+        """Toggle between auto-run and manual mode."""
+        new_mode = self.config.toggle_auto_run_mode()
+        mode_text = "Auto-Run" if new_mode else "Manual"
+        self.console.print(f"[green]Mode changed to: {mode_text}[/green]")
+    
+    def _clear_for_first_message(self, message: str) -> None:
+        """Clear the welcome screen before the first message, then disable itself."""
+        self._prepare_first_message = lambda message: None
+        # Clear the console completely
+        self.console.clear()
+        # Re-print the user's message so it stays visible
+        self.console.print(f"[bold blue]You:[/bold blue] {message}")
     
     async def _process_user_message(self, message: str) -> None:
         """Process natural language user message."""
+        # Messages for this turn are written to the chat together at the end
+        new_messages = []
         try:
             # Clear screen on first message (but keep user message visible)
-            if self.first_message:
-                # Clear the console completely
-                import os
-                os.system('cls' if os.name == 'nt' else 'clear')
-                # Re-print the user's message so it stays visible
-                self.console.print(f"[bold blue]You:[/bold blue] {message}")
-                self.first_message = False
+            self._prepare_first_message(message)
             
             # Increment message count
-            self.message_count += 1
+            self.stats.message_count += 1
             
             # Create new chat if none exists
             if not self.chat_manager.current_chat:
                 self.chat_manager.create_new_chat()
             
             # Add user message to chat
-            self.chat_manager.add_message("user", message)
+            new_messages.append(self.chat_manager.make_message("user", message))
             
             # Get AI response (streaming is handled in chat_interface)
-            ai_response, tokens_used = await self.chat_interface.get_ai_response_with_tokens(message, self.current_context)
+            ai_response, tokens_used, prompt_tokens, cached_tokens = await self.chat_interface.get_ai_response_with_tokens(
+                message, self.current_context
+            )
             
             # Track tokens
-            if tokens_used:
-                self.total_tokens += tokens_used
+            self.stats.add_usage(tokens_used, prompt_tokens, cached_tokens)
             
             # Add AI response to chat
-            self.chat_manager.add_message("assistant", ai_response, tokens_used)
+            new_messages.append(self.chat_manager.make_message("assistant", ai_response, tokens_used))
             
             # Note: AI response is already displayed via streaming, no need to display again
             
@@ -228,13 +403,12 @@ class PointerCLI:
                 executed_tools_with_results = await self._execute_tools_and_collect_results(tools_to_execute)
                 
                 # Get AI follow-up after tool execution (always enabled for tool execution flow)
-                followup_response, followup_tokens = await self.chat_interface.get_ai_response_with_tokens(
+                followup_response, followup_tokens, prompt_tokens, cached_tokens = await self.chat_interface.get_ai_response_with_tokens(
                     self._create_followup_prompt(executed_tools_with_results), self.current_context
                 )
                 
                 # Track follow-up tokens
-                if followup_tokens:
-                    self.total_tokens += followup_tokens
+                self.stats.add_usage(followup_tokens, prompt_tokens, cached_tokens)
                 
                 # Parse and execute any follow-up tools
                 followup_tools = self.chat_interface.parse_tools(followup_response)
@@ -249,98 +423,101 @@ class PointerCLI:
             # Don't show the error again if it was already displayed by chat_interface
             if "Error getting AI response:" not in str(e):
                 self.console.print(f"[red]Error processing message: {e}[/red]")
+        finally:
+            self.chat_manager.add_messages(new_messages)
     
     async def _execute_tools_and_collect_results(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Execute tools from AI response and return them with results."""
         executed_tools = []
         
-        for tool in tools:
-            try:
-
-                
-                # Execute the tool
-                result = await self.tool_manager.execute_tool(tool)
-                
-                # Add to executed tools with result
-                executed_tools.append({
-                    **tool,
-                    "result": result,
-                    "status": "success"
-                })
-                
-                if self.config.ui.show_tool_outputs:
-                    # Show detailed output
-                    self.console.print(Panel(
-                        result,
-                        title=f"Tool: {tool['name']}",
-                        border_style="blue"
-                    ))
-                else:
-                    # Show basic information only
-                    self.console.print(f"[green]✓ {tool['name']} completed successfully[/green]")
-                
-            except Exception as e:
-                error_msg = f"Error executing tool {tool.get('name', 'unknown')}: {e}"
-                self.console.print(f"[red]{error_msg}[/red]")
-                
-                # Add to executed tools with error
-                executed_tools.append({
-                    **tool,
-                    "result": error_msg,
-                    "status": "error"
-                })
+        for batch in self._batch_tools(tools):
+            # Read-only tools in a batch run concurrently; results are handled in order
+            results = await asyncio.gather(
+                *(self.tool_manager.execute_tool(tool) for tool in batch),
+                return_exceptions=True
+            )
+            outputs = []
+            for tool, result in zip(batch, results):
+                executed_tool, output = self._handle_tool_result(tool, result)
+                executed_tools.append(executed_tool)
+                outputs.append(output)
+            
+            # One print per batch instead of one per tool
+            self.console.print(Group(*outputs))
         
         return executed_tools
-
+    
+    def _batch_tools(self, tools: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """Group consecutive read-only tools; every other tool runs alone, in order."""
+        batch = []
+        for tool in tools:
+            if tool.get('name') in ToolManager.READ_ONLY_TOOLS:
+                batch.append(tool)
+                continue
+            
+            if batch:
+                yield batch
+                batch = []
+            yield [tool]
+        
+        if batch:
+            yield batch
+    
+    def _handle_tool_result(self, tool: Dict[str, Any], result: Any) -> Tuple[Dict[str, Any], RenderableType]:
+        """Record a tool's result (or the exception it raised) on it and build its display."""
+        try:
+            if isinstance(result, BaseException):
+                raise result
+            
+            if self.config.ui.show_tool_outputs:
+                # Show detailed output
+                output = Panel(
+                    result,
+                    title=f"Tool: {tool['name']}",
+                    border_style="blue"
+                )
+            else:
+                # Show basic information only
+                output = f"[green]✓ {tool['name']} completed successfully[/green]"
+            
+            # Tool dicts are parsed fresh for each response, so record the outcome in place
+            tool["result"] = result
+            tool["status"] = "success"
+            return tool, output
+            
+        except Exception as e:
+            error_msg = f"Error executing tool {tool.get('name', 'unknown')}: {e}"
+            
+            tool["result"] = error_msg
+            tool["status"] = "error"
+            return tool, f"[red]{error_msg}[/red]"
+    
     async def _execute_tools(self, tools: List[Dict[str, Any]]) -> None:
         """Execute tools from AI response."""
-        for tool in tools:
-            try:
-
-                
-                # Execute the tool
-                result = await self.tool_manager.execute_tool(tool)
-                
-                if self.config.ui.show_tool_outputs:
-                    # Show detailed output
-                    self.console.print(Panel(
-                        result,
-                        title=f"Tool: {tool['name']}",
-                        border_style="blue"
-                    ))
-                else:
-                    # Show basic information only
-                    self.console.print(f"[green]✓ {tool['name']} completed successfully[/green]")
-                
-            except Exception as e:
-                self.console.print(f"[red]Error executing tool {tool['name']}: {e}[/red]")
+        await self._execute_tools_and_collect_results(tools)
     
-
+    @staticmethod
+    def _format_tool_args(tool_args: Dict[str, Any]) -> str:
+        """Format tool arguments as a comma-separated key=value list."""
+        return ", ".join(f"{k}={v}" for k, v in tool_args.items())
     
     def _create_tool_summary(self, tools: List[Dict[str, Any]]) -> str:
         """Create a summary of executed tools for AI analysis."""
-        summary_parts = []
-        
+        return "\n".join(self._iter_tool_summary_lines(tools))
+    
+    def _iter_tool_summary_lines(self, tools: List[Dict[str, Any]]) -> Iterator[str]:
+        """Yield the summary lines for each executed tool."""
         for i, tool in enumerate(tools, 1):
-            tool_name = tool.get('name', 'unknown')
-            tool_args = tool.get('args', {})
-            tool_result = tool.get('result', 'No result')
-            tool_status = tool.get('status', 'unknown')
-            
-            summary_parts.append(f"{i}. {tool_name}")
+            yield f"{i}. {tool.get('name', 'unknown')}"
+            tool_args = tool.get('args')
             if tool_args:
-                # Format arguments nicely
-                args_str = ", ".join([f"{k}={v}" for k, v in tool_args.items()])
-                summary_parts.append(f"   Args: {args_str}")
+                yield f"   Args: {self._format_tool_args(tool_args)}"
             
-            # Add result and status
+            tool_status = tool.get('status', 'unknown')
             if tool_status == 'success':
-                summary_parts.append(f"   Result: {tool_result}")
+                yield f"   Result: {tool.get('result', 'No result')}"
             elif tool_status == 'error':
-                summary_parts.append(f"   Error: {tool_result}")
-
-        
-        return "\n".join(summary_parts)
+                yield f"   Error: {tool.get('result', 'No result')}"
     
     def _create_followup_prompt(self, executed_tools: List[Dict[str, Any]]) -> str:
         """Create follow-up prompt for AI analysis."""
@@ -357,17 +534,15 @@ Please provide a brief analysis of the results and any follow-up suggestions or
         if not tools:
             return
             
-        # Create a formatted summary for the panel
-        summary_text = ""
+        # Create a formatted summary for the panel, one block per tool joined once
+        blocks = []
         for i, tool in enumerate(tools, 1):
-            tool_name = tool.get('name', 'unknown')
-            tool_args = tool.get('args', {})
-            
-            summary_text += f"{i}. {tool_name}\n"
+            block = f"{i}. {tool.get('name', 'unknown')}"
+            tool_args = tool.get('args')
             if tool_args:
-                args_str = ", ".join([f"{k}={v}" for k, v in tool_args.items()])
-                summary_text += f"   Args: {args_str}\n"
-            summary_text += "\n"
+                block += f"\n   Args: {self._format_tool_args(tool_args)}"
+            blocks.append(block)
+        summary_text = "\n\n".join(blocks)
         
         # Display in a nice panel
         self.console.print(Panel(
@@ -381,28 +556,23 @@ Please provide a brief analysis of the results and any follow-up suggestions or
         if not tools:
             return True
             
-        tool_names = [tool.get('name', 'unknown') for tool in tools]
-        tools_str = ", ".join(tool_names)
-        
-        self.console.print(f"[yellow]Execute these tools?[/yellow] {tools_str}")
+        tools_str = ", ".join(tool.get('name', 'unknown') for tool in tools)
         
-        while True:
-            response = input("Proceed? (y/n): ").strip().lower()
-            if response in ['y', 'yes']:
-                return True
-            elif response in ['n', 'no']:
-                return False
-            else:
-                self.console.print("[yellow]Please enter 'y' or 'n'[/yellow]")
+        # Confirm validates the y/n answer itself and returns a bool
+        return await self.chat_interface.read_input(
+            functools.partial(Confirm.ask, f"[yellow]Execute these tools?[/yellow] {escape(tools_str)}", default=False)
+        )
     
     def _display_ai_response(self, response: str, title: str, border_style: str) -> None:
         """Display AI response with thinking and main content in separate panels."""
         # Split response into thinking and main content
         thinking_content, main_content = self._split_ai_response(response)
         
+        panels = []
+        
         # Display thinking in separate gray panel if present
         if thinking_content:
-            self.console.print(Panel(
+            panels.append(Panel(
                 thinking_content, 
                 title="Thinking", 
                 border_style="bright_black"
@@ -410,38 +580,45 @@ Please provide a brief analysis of the results and any follow-up suggestions or
         
         # Display main response
         if main_content.strip():
-            self.console.print(Panel(main_content, title=title, border_style=border_style))
+            panels.append(Panel(main_content, title=title, border_style=border_style))
+        
+        # Print both panels in a single write
+        if panels:
+            self.console.print(Group(*panels))
     
     def _split_ai_response(self, response: str) -> tuple[str, str]:
         """Split AI response into thinking content and main content."""
-        import re
-        
-        # Find thinking blocks
-        think_match = re.search(r'<think>(.*?)</think>', response, flags=re.DOTALL)
+        # Cheap substring test covers the common case of no thinking block
+        if '<think>' not in response:
+            return "", response
         
-        if think_match:
-            # Extract thinking content
-            thinking_content = think_match.group(1).strip()
-            
-            # Remove thinking blocks from main content
-            main_content = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL).strip()
-            
-            return thinking_content, main_content
-        else:
-            # No thinking content found
+        # One pass finds the thinking blocks and keeps the text between them
+        thinking_content = None
+        main_parts = []
+        last = 0
+        for think_match in _THINK_RE.finditer(response):
+            if thinking_content is None:
+                thinking_content = think_match.group(1).strip()
+            main_parts.append(response[last:think_match.start()])
+            last = think_match.end()
+        
+        if thinking_content is None:
+            # No complete thinking block found
             return "", response
+        
+        main_parts.append(response[last:])
+        return thinking_content, "".join(main_parts).strip()
     
     def _show_info(self) -> None:
         """Show session information including token usage."""
-        import time
-        
-        if self.session_start_time is None:
+        stats = self.stats
+        if stats.session_start_time is None:
             self.console.print("[yellow]Session information not available yet.[/yellow]")
             return
         
         # Calculate session duration
         current_time = time.time()
-        session_duration = current_time - self.session_start_time
+        session_duration = current_time - stats.session_start_time
         
         # Format duration
         hours = int(session_duration // 3600)
@@ -455,34 +632,23 @@ Please provide a brief analysis of the results and any follow-up suggestions or
         else:
             duration_str = f"{seconds}s"
         
-        # Calculate average tokens per message
-        avg_tokens = self.total_tokens / self.message_count if self.message_count > 0 else 0
-        
         # Create info display
-        info_text = Text()
-        info_text.append("Session Information:\n\n", style="bold")
-        
-        info_text.append("Duration: ", style="bold")
-        info_text.append(f"{duration_str}\n")
-        
-        info_text.append("Messages: ", style="bold")
-        info_text.append(f"{self.message_count}\n")
-        
-        info_text.append("Total Tokens: ", style="bold")
-        info_text.append(f"{self.total_tokens:,}\n")
-        
-        info_text.append("Avg Tokens/Message: ", style="bold")
-        info_text.append(f"{avg_tokens:.1f}\n\n")
-        
-        info_text.append("Configuration:\n", style="bold")
-        info_text.append("Model: ", style="bold")
-        info_text.append(f"{self.config.api.model_name}\n")
-        info_text.append("API Base URL: ", style="bold")
-        info_text.append(f"{self.config.api.base_url}\n")
+        info_text = (
+            "[bold]Session Information:\n\n[/bold]"
+            f"[bold]Duration: [/bold]{duration_str}\n"
+            f"[bold]Messages: [/bold]{stats.message_count}\n"
+            f"[bold]Total Tokens: [/bold]{stats.total_tokens:,}\n"
+            f"[bold]Avg Tokens/Message: [/bold]{stats.avg_tokens:.1f}\n"
+            f"[bold]Cached Tokens: [/bold]{stats.cached_tokens:,}\n"
+            f"[bold]Cache Hit Rate: [/bold]{stats.cache_hit_rate:.1%}\n\n"
+            "[bold]Configuration:\n[/bold]"
+            f"[bold]Model: [/bold]{escape(self.config.api.model_name)}\n"
+            f"[bold]API Base URL: [/bold]{escape(self.config.api.base_url)}\n"
+        )
         
         self.console.print(Panel(info_text, title="Session Info", border_style="green"))
     
-    def _handle_chat_command(self, args: List[str]) -> None:
+    async def _handle_chat_command(self, args: List[str]) -> None:
         """Handle chat management commands."""
         if not args:
             self._show_chat_help()
@@ -491,52 +657,27 @@ Please provide a brief analysis of the results and any follow-up suggestions or
         subcommand = args[0].lower()
         sub_args = args[1:] if len(args) > 1 else []
         
-        if subcommand == "new":
-            self._create_new_chat(sub_args)
-        elif subcommand == "load":
-            self._load_chat(sub_args)
-        elif subcommand == "save":
-            self._save_chat()
-        elif subcommand == "list":
-            self._list_chats()
-        elif subcommand == "delete":
-            self._delete_chat(sub_args)
-        elif subcommand == "current":
-            self._show_current_chat()
-        else:
+        handler = self._chat_handlers.get(subcommand)
+        if handler is None:
             self.console.print(f"[red]Unknown chat command: {subcommand}[/red]")
             self._show_chat_help()
+            return
+        
+        result = handler(sub_args)
+        if asyncio.iscoroutine(result):
+            await result
     
     def _show_chat_help(self) -> None:
         """Show chat command help."""
-        help_text = Text()
-        help_text.append("Chat Management Commands:\n\n", style="bold")
-        
-        help_text.append("/chats new [title]", style="bold blue")
-        help_text.append(" - Create a new chat session\n")
-        
-        help_text.append("/chats load <chat_id>", style="bold blue")
-        help_text.append(" - Load a saved chat session\n")
-        
-        help_text.append("/chats save", style="bold blue")
-        help_text.append(" - Save the current chat session\n")
-        
-        help_text.append("/chats list", style="bold blue")
-        help_text.append(" - List all saved chat sessions\n")
-        
-        help_text.append("/chats delete <chat_id>", style="bold blue")
-        help_text.append(" - Delete a saved chat session\n")
-        
-        help_text.append("/chats current", style="bold blue")
-        help_text.append(" - Show current chat information\n")
-        
-        self.console.print(Panel(help_text, title="Chat Commands", border_style="blue"))
+        self.console.print(_build_chat_help_panel())
     
-    def _create_new_chat(self, args: List[str]) -> None:
+    async def _create_new_chat(self, args: List[str]) -> None:
         """Create a new chat session."""
         title = " ".join(args) if args else None
         if not title:
-            title = Prompt.ask("Enter chat title (or press Enter for auto-generated)", default="")
+            title = await self.chat_interface.read_input(
+                functools.partial(Prompt.ask, "Enter chat title (or press Enter for auto-generated)", default="")
+            )
         
         chat = self.chat_manager.create_new_chat(title if title else None)
         
@@ -557,10 +698,10 @@ Please provide a brief analysis of the results and any follow-up suggestions or
             self.console.print(f"[dim]Messages: {len(chat.messages)}, Tokens: {chat.total_tokens}[/dim]")
             
             # Restore conversation history in chat interface
-            self.chat_interface.conversation_history = [
+            self.chat_interface.set_history(
                 {"role": msg.role, "content": msg.content}
                 for msg in chat.messages
-            ]
+            )
         else:
             self.console.print(f"[red]Chat not found: {chat_id}[/red]")
     
@@ -581,29 +722,33 @@ Please provide a brief analysis of the results and any follow-up suggestions or
             self.console.print("[yellow]No saved chats found.[/yellow]")
             return
         
-        chat_text = Text()
-        chat_text.append("Available Chats:\n\n", style="bold")
+        # Collect (text, style) pieces and build the Text in one call
+        parts = [("Available Chats:\n\n", "bold")]
         
         for i, chat in enumerate(chats, 1):
             # Format timestamp
-            from datetime import datetime
+            last_modified = chat.get("last_modified")
             try:
-                dt = datetime.fromisoformat(chat["last_modified"])
-                time_str = dt.strftime("%Y-%m-%d %H:%M")
-            except:
-                time_str = chat["last_modified"]
+                time_str = datetime.fromisoformat(last_modified).strftime("%Y-%m-%d %H:%M")
+            except (TypeError, ValueError):
+                time_str = last_modified or "unknown"
             
-            chat_text.append(f"{i}. ", style="bold blue")
-            chat_text.append(f"{chat['title']}\n")
-            chat_text.append(f"   ID: {chat['id']}\n", style="dim")
-            chat_text.append(f"   Messages: {chat['message_count']}, Tokens: {chat['total_tokens']}\n", style="dim")
-            chat_text.append(f"   Last modified: {time_str}\n\n", style="dim")
+            parts.append((f"{i}. ", "bold blue"))
+            parts.append(f"{chat['title']}\n")
+            # The dim detail lines share one style, so they form one piece
+            parts.append((
+                f"   ID: {chat['id']}\n"
+                f"   Messages: {chat['message_count']}, Tokens: {chat['total_tokens']}\n"
+                f"   Last modified: {time_str}\n\n",
+                "dim"
+            ))
         
-        chat_text.append("Use /chats load <chat_id> to load a chat", style="italic")
+        parts.append(("Use /chats load <chat_id> to load a chat", "italic"))
+        chat_text = Text.assemble(*parts)
         
         self.console.print(Panel(chat_text, title="Chat History", border_style="blue"))
     
-    def _delete_chat(self, args: List[str]) -> None:
+    async def _delete_chat(self, args: List[str]) -> None:
         """Delete a chat session."""
         if not args:
             self.console.print("[red]Please provide a chat ID. Use /chats list to see available chats.[/red]")
@@ -612,9 +757,11 @@ Please provide a brief analysis of the results and any follow-up suggestions or
         chat_id = args[0]
         
         # Confirm deletion
-        confirm = Prompt.ask(f"Are you sure you want to delete chat '{chat_id}'?", choices=["y", "n"], default="n")
+        confirm = await self.chat_interface.read_input(
+            functools.partial(Confirm.ask, f"Are you sure you want to delete chat '{escape(chat_id)}'?", default=False)
+        )
         
-        if confirm.lower() == "y":
+        if confirm:
             if self.chat_manager.delete_chat(chat_id):
                 self.console.print(f"[green]Deleted chat: {chat_id}[/green]")
             else:
@@ -630,114 +777,77 @@ Please provide a brief analysis of the results and any follow-up suggestions or
         
         chat = self.chat_manager.current_chat
         
-        chat_text = Text()
-        chat_text.append(f"Title: ", style="bold")
-        chat_text.append(f"{chat.title}\n")
-        chat_text.append(f"ID: ", style="bold")
-        chat_text.append(f"{chat.id}\n")
-        chat_text.append(f"Created: ", style="bold")
-        chat_text.append(f"{chat.created_at}\n")
-        chat_text.append(f"Last Modified: ", style="bold")
-        chat_text.append(f"{chat.last_modified}\n")
-        chat_text.append(f"Messages: ", style="bold")
-        chat_text.append(f"{len(chat.messages)}\n")
-        chat_text.append(f"Total Tokens: ", style="bold")
-        chat_text.append(f"{chat.total_tokens}\n")
+        chat_text = (
+            f"[bold]Title: [/bold]{escape(chat.title)}\n"
+            f"[bold]ID: [/bold]{escape(chat.id)}\n"
+            f"[bold]Created: [/bold]{chat.created_at}\n"
+            f"[bold]Last Modified: [/bold]{chat.last_modified}\n"
+            f"[bold]Messages: [/bold]{len(chat.messages)}\n"
+            f"[bold]Total Tokens: [/bold]{chat.total_tokens}\n"
+        )
         
         self.console.print(Panel(chat_text, title="Current Chat", border_style="green"))
     
     def _show_help(self) -> None:
         """Show help information."""
-        help_text = Text()
-        help_text.append("Pointer CLI Commands:\n\n", style="bold")
-        
-        help_text.append("/help", style="bold blue")
-        help_text.append(" - Show this help message\n")
-        
-        help_text.append("/config", style="bold blue")
-        help_text.append(" - Show current configuration\n")
-        
-        help_text.append("/mode", style="bold blue")
-        help_text.append(" - Toggle between auto-run and manual mode\n")
-        
-        help_text.append("/status", style="bold blue")
-        help_text.append(" - Show current status and context\n")
-        
-        help_text.append("/info", style="bold blue")
-        help_text.append(" - Show session information and token usage\n")
-        
-        help_text.append("/chats", style="bold blue")
-        help_text.append(" - Chat management (new, load, save, list, delete, current)\n")
-        
-        help_text.append("/context", style="bold blue")
-        help_text.append(" - Codebase context management (refresh, enable, disable, show, search, config)\n")
-        
-        help_text.append("/clear", style="bold blue")
-        help_text.append(" - Clear the screen\n")
-        
-        help_text.append("/exit", style="bold blue")
-        help_text.append(" - Exit Pointer CLI\n\n")
-        
-        help_text.append("Natural Language:\n", style="bold")
-        help_text.append("You can interact with Pointer CLI using natural language.\n")
-        help_text.append("Ask questions, request file operations, or describe what you want to do.\n\n")
-        
-        help_text.append("Configuration Notes:\n", style="bold")
-        help_text.append("• /mode - Toggle between auto-run (immediate execution) and manual (confirmation required)\n")
-        help_text.append("• Show AI Responses: false = shows response box but hides content\n")
-        help_text.append("• AI follow-up after tool execution is always enabled\n")
-        help_text.append("• Show Thinking: only relevant when AI responses are enabled\n")
-        
-        self.console.print(Panel(help_text, title="Help", border_style="green"))
+        self.console.print(_build_help_panel())
     
     def _show_config(self) -> None:
         """Show current configuration."""
-        config_text = Text()
-        config_text.append("Current Configuration:\n\n", style="bold")
+        config = self.config
         
         # Show config file location
-        from .config import Config
         config_path = Config.get_default_config_path()
-        config_text.append("Configuration File:\n", style="bold blue")
-        config_text.append(f"  Location: {config_path}\n")
-        config_text.append(f"  Exists: {'Yes' if config_path.exists() else 'No'}\n\n")
-        
-        config_text.append("API Settings:\n", style="bold blue")
-        config_text.append(f"  Base URL: {self.config.api.base_url}\n")
-        config_text.append(f"  Model: {self.config.api.model_name}\n")
-        config_text.append(f"  Timeout: {self.config.api.timeout}s\n")
-        config_text.append(f"  Max Retries: {self.config.api.max_retries}\n\n")
-        
-        config_text.append("UI Settings:\n", style="bold blue")
-        config_text.append(f"  Show AI Responses: {self.config.ui.show_ai_responses}\n")
-        if self.config.ui.show_ai_responses:
-            config_text.append(f"  Show Thinking: {self.config.ui.show_thinking}\n")
-        config_text.append(f"  Show Tool Outputs: {self.config.ui.show_tool_outputs}\n")
-        config_text.append(f"  Show Diffs: {self.config.ui.show_diffs}\n")
-        config_text.append(f"  Theme: {self.config.ui.theme}\n")
-        config_text.append(f"  AI Follow-up: Always enabled after tool execution\n\n")
-        
-        config_text.append("Mode Settings:\n", style="bold blue")
-        config_text.append(f"  Auto-Run Mode: {self.config.mode.auto_run_mode}\n\n")
-        
-        config_text.append("Codebase Context:\n", style="bold blue")
-        config_text.append(f"  Include Context: {self.config.codebase.include_context}\n")
-        config_text.append(f"  Max Context Files: {self.config.codebase.max_context_files}\n")
-        config_text.append(f"  Context Depth: {self.config.codebase.context_depth}\n")
-        config_text.append(f"  Auto Refresh: {self.config.codebase.auto_refresh_context}\n")
-        
-        self.console.print(Panel(config_text, title="Configuration", border_style="yellow"))
+        config_exists = config_path.exists()
+        cache_key = (config.version, config_exists)
+        if self._config_panel is not None and self._config_panel[0] == cache_key:
+            self.console.print(self._config_panel[1])
+            return
+        
+        config_text = (
+            "[bold]Current Configuration:\n\n[/bold]"
+            "[bold blue]Configuration File:\n[/bold blue]"
+            f"  Location: {escape(str(config_path))}\n"
+            f"  Exists: {'Yes' if config_exists else 'No'}\n\n"
+            "[bold blue]API Settings:\n[/bold blue]"
+            f"  Base URL: {escape(config.api.base_url)}\n"
+            f"  Model: {escape(config.api.model_name)}\n"
+            f"  Timeout: {config.api.timeout}s\n"
+            f"  Max Retries: {config.api.max_retries}\n\n"
+            "[bold blue]UI Settings:\n[/bold blue]"
+            f"  Show AI Responses: {config.ui.show_ai_responses}\n"
+        )
+        if config.ui.show_ai_responses:
+            config_text += f"  Show Thinking: {config.ui.show_thinking}\n"
+        config_text += (
+            f"  Show Tool Outputs: {config.ui.show_tool_outputs}\n"
+            f"  Show Diffs: {config.ui.show_diffs}\n"
+            f"  Theme: {escape(config.ui.theme)}\n"
+            "  AI Follow-up: Always enabled after tool execution\n\n"
+            "[bold blue]Mode Settings:\n[/bold blue]"
+            f"  Auto-Run Mode: {config.mode.auto_run_mode}\n\n"
+            "[bold blue]Codebase Context:\n[/bold blue]"
+            f"  Include Context: {config.codebase.include_context}\n"
+            f"  Max Context Files: {config.codebase.max_context_files}\n"
+            f"  Context Depth: {config.codebase.context_depth}\n"
+            f"  Auto Refresh: {config.codebase.auto_refresh_context}\n"
+        )
+        
+        panel = Panel(config_text, title="Configuration", border_style="yellow")
+        self._config_panel = (cache_key, panel)
+        self.console.print(panel)
     
     def _show_status(self) -> None:
         """Show current status."""
-        status_text = Text()
-        status_text.append("Current Status:\n\n", style="bold")
-        
-        status_text.append(f"Project Root: {self.current_context.get('project_root', 'None')}\n")
-        status_text.append(f"Current Directory: {self.current_context.get('current_directory', 'None')}\n")
-        status_text.append(f"Git Repository: {self.current_context.get('is_git_repo', False)}\n")
-        status_text.append(f"Mode: {'Auto-Run' if self.config.mode.auto_run_mode else 'Manual'}\n")
-        status_text.append(f"Running: {self.running}\n")
+        context = self.current_context
+        status_text = (
+            "[bold]Current Status:\n\n[/bold]"
+            f"Project Root: {escape(str(context.get('project_root', 'None')))}\n"
+            f"Current Directory: {escape(str(context.get('current_directory', 'None')))}\n"
+            f"Git Repository: {context.get('is_git_repo', False)}\n"
+            f"Mode: {'Auto-Run' if self.config.mode.auto_run_mode else 'Manual'}\n"
+            f"Running: {self.running}\n"
+        )
         
         self.console.print(Panel(status_text, title="Status", border_style="cyan"))
     
@@ -764,18 +874,22 @@ Please provide a brief analysis of the results and any follow-up suggestions or
         
         if subcommand == "refresh":
             self.console.print("[blue]Refreshing codebase context...[/blue]")
-            self.chat_interface.codebase_context.force_refresh()
-            summary = self.chat_interface.codebase_context.get_context_summary()
+            self._resolve_project_root()
+            self._initialize_context()
+            codebase_context = self.chat_interface.codebase_context
+            codebase_context.set_project_root(self._project_root)
+            codebase_context.force_refresh()
+            summary = codebase_context.get_context_summary()
             self.console.print(f"[green]Context refreshed! Found {summary.get('total_files', 0)} files.[/green]")
         
         elif subcommand == "enable":
             self.config.codebase.include_context = True
-            self.config.save()
+            self.config.request_save()
             self.console.print("[green]Codebase context enabled.[/green]")
         
         elif subcommand == "disable":
             self.config.codebase.include_context = False
-            self.config.save()
+            self.config.request_save()
             self.console.print("[yellow]Codebase context disabled.[/yellow]")
         
         elif subcommand == "show":
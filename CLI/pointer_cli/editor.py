@@ -3,6 +3,7 @@ Advanced code editing system for Pointer CLI.
 """
 
 import re
+import functools
 from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
 from dataclasses import dataclass
@@ -15,6 +16,15 @@ from rich.text import Text
 
 from .utils import safe_read_file, safe_write_file, create_diff, is_text_file
 
+_LINE_RE = re.compile(r'line\s+(\d+)')
+_ADD_RE = re.compile(r'add\s+"([^"]+)"')
+_WITH_RE = re.compile(r'with\s+"([^"]+)"')
+
+@functools.lru_cache(maxsize=256)
+def _compiled(pattern: str, flags: int) -> re.Pattern:
+    """Compile a search pattern, reusing it across calls."""
+    return re.compile(pattern, flags)
+
 class EditType(Enum):
     """Types of edits that can be performed."""
     REPLACE_LINE = "replace_line"
@@ -45,7 +55,23 @@ class CodeEditor:
         self.console = console
         self.history = []
         self.current_file = None
-        self.current_content = None
+        # Lines are the working copy; the joined string is rebuilt only when read
+        self._lines: Optional[List[str]] = None
+        self._content: Optional[str] = None
+        # Content before the first edit in the history, for show_diff
+        self._diff_base: Optional[str] = None
+    
+    @property
+    def current_content(self) -> Optional[str]:
+        """Current content as a single string."""
+        if self._content is None and self._lines is not None:
+            self._content = '\n'.join(self._lines)
+        return self._content
+    
+    @current_content.setter
+    def current_content(self, content: Optional[str]) -> None:
+        self._content = content
+        self._lines = content.split('\n') if content is not None else None
     
     def load_file(self, file_path: Path) -> bool:
         """Load a file for editing."""
@@ -74,53 +100,47 @@ class CodeEditor:
     
     def get_line_count(self) -> int:
         """Get number of lines in current content."""
-        if self.current_content is None:
+        if self._lines is None:
             return 0
-        return len(self.current_content.split('\n'))
+        return len(self._lines)
     
     def get_line(self, line_num: int) -> Optional[str]:
         """Get a specific line (1-based indexing)."""
-        if self.current_content is None:
+        if self._lines is None:
             return None
         
-        lines = self.current_content.split('\n')
-        if 1 <= line_num <= len(lines):
-            return lines[line_num - 1]
+        if 1 <= line_num <= len(self._lines):
+            return self._lines[line_num - 1]
         return None
     
     def get_lines(self, start_line: int, end_line: int) -> List[str]:
         """Get a range of lines (1-based indexing)."""
-        if self.current_content is None:
+        if self._lines is None:
             return []
         
-        lines = self.current_content.split('\n')
         start_idx = max(0, start_line - 1)
-        end_idx = min(len(lines), end_line)
+        end_idx = min(len(self._lines), end_line)
         
-        return lines[start_idx:end_idx]
+        return self._lines[start_idx:end_idx]
     
     def apply_edit(self, edit: EditOperation) -> bool:
         """Apply a single edit operation."""
-        if self.current_content is None:
+        lines = self._lines
+        if lines is None:
             return False
         
         try:
-            new_content = self._apply_edit_to_content(self.current_content, edit)
-            if new_content != self.current_content:
-                # Save to history
-                self.history.append({
-                    "operation": edit,
-                    "old_content": self.current_content,
-                    "new_content": new_content
-                })
-                
-                self.current_content = new_content
-                return True
-            
-            return False
+            start, end, new_lines = self._edit_splice(lines, edit)
         except Exception as e:
             self.console.print(f"[red]Error applying edit: {e}[/red]")
             return False
+        
+        old_lines = lines[start:end]
+        if old_lines == new_lines:
+            return False
+        
+        self._record_splice(edit, start, old_lines, new_lines)
+        return True
     
     def apply_edits(self, edits: List[EditOperation]) -> bool:
         """Apply multiple edit operations."""
@@ -134,58 +154,63 @@ class CodeEditor:
         
         return success
     
-    def _apply_edit_to_content(self, content: str, edit: EditOperation) -> str:
-        """Apply edit to content string."""
-        lines = content.split('\n')
-        
+    def _record_splice(self, operation: EditOperation, start: int, old_lines: List[str], new_lines: List[str]) -> None:
+        """Replace old_lines at start with new_lines and remember how to undo it."""
+        if not self.history:
+            self._diff_base = self.current_content
+        
+        self._lines[start:start + len(old_lines)] = new_lines
+        self._content = None
+        
+        # Only the touched lines are kept, so history grows with edit size, not file size
+        self.history.append({
+            "operation": operation,
+            "start": start,
+            "old_lines": old_lines,
+            "new_count": len(new_lines)
+        })
+    
+    def _edit_splice(self, lines: List[str], edit: EditOperation) -> Tuple[int, int, List[str]]:
+        """Work out an edit as a splice: lines[start:end] becomes the returned lines."""
         if edit.type == EditType.REPLACE_LINE:
             if edit.line and 1 <= edit.line <= len(lines):
-                lines[edit.line - 1] = edit.text
-            else:
-                raise ValueError(f"Invalid line number: {edit.line}")
+                return edit.line - 1, edit.line, [edit.text]
+            raise ValueError(f"Invalid line number: {edit.line}")
         
         elif edit.type == EditType.INSERT_LINE:
             if edit.line and 0 <= edit.line <= len(lines):
-                lines.insert(edit.line, edit.text)
-            else:
-                raise ValueError(f"Invalid line number: {edit.line}")
+                return edit.line, edit.line, [edit.text]
+            raise ValueError(f"Invalid line number: {edit.line}")
         
         elif edit.type == EditType.DELETE_LINE:
             if edit.line and 1 <= edit.line <= len(lines):
-                lines.pop(edit.line - 1)
-            else:
-                raise ValueError(f"Invalid line number: {edit.line}")
+                return edit.line - 1, edit.line, []
+            raise ValueError(f"Invalid line number: {edit.line}")
         
         elif edit.type == EditType.REPLACE_TEXT:
+            # Text may span lines, so this one works on the joined content
+            content = self.current_content
             if edit.old_text in content:
-                return content.replace(edit.old_text, edit.new_text)
-            else:
-                raise ValueError(f"Text not found: {edit.old_text}")
+                return 0, len(lines), content.replace(edit.old_text, edit.new_text).split('\n')
+            raise ValueError(f"Text not found: {edit.old_text}")
         
         elif edit.type == EditType.REPLACE_BLOCK:
             if edit.start_line and edit.end_line and 1 <= edit.start_line <= edit.end_line <= len(lines):
-                start_idx = edit.start_line - 1
-                end_idx = edit.end_line
-                lines[start_idx:end_idx] = edit.text.split('\n')
-            else:
-                raise ValueError(f"Invalid line range: {edit.start_line}-{edit.end_line}")
+                return edit.start_line - 1, edit.end_line, edit.text.split('\n')
+            raise ValueError(f"Invalid line range: {edit.start_line}-{edit.end_line}")
         
         elif edit.type == EditType.INSERT_BLOCK:
             if edit.line and 0 <= edit.line <= len(lines):
-                new_lines = edit.text.split('\n')
-                lines[edit.line:edit.line] = new_lines
-            else:
-                raise ValueError(f"Invalid line number: {edit.line}")
+                return edit.line, edit.line, edit.text.split('\n')
+            raise ValueError(f"Invalid line number: {edit.line}")
         
         elif edit.type == EditType.DELETE_BLOCK:
             if edit.start_line and edit.end_line and 1 <= edit.start_line <= edit.end_line <= len(lines):
-                start_idx = edit.start_line - 1
-                end_idx = edit.end_line
-                del lines[start_idx:end_idx]
-            else:
-                raise ValueError(f"Invalid line range: {edit.start_line}-{edit.end_line}")
+                return edit.start_line - 1, edit.end_line, []
+            raise ValueError(f"Invalid line range: {edit.start_line}-{edit.end_line}")
         
-        return '\n'.join(lines)
+        # Unknown edit types leave the content unchanged
+        return 0, 0, []
     
     def save_file(self, file_path: Optional[Path] = None) -> bool:
         """Save current content to file."""
@@ -205,7 +230,7 @@ class CodeEditor:
             return
         
         # Get original content
-        original_content = self.history[0]["old_content"]
+        original_content = self._diff_base
         current_content = self.current_content
         
         if original_content == current_content:
@@ -252,7 +277,7 @@ class CodeEditor:
             self.console.print("[red]No content loaded[/red]")
             return
         
-        lines = self.current_content.split('\n')
+        lines = self._lines
         if end_line is None:
             end_line = len(lines)
         
@@ -269,34 +294,27 @@ class CodeEditor:
         if self.current_content is None:
             return []
         
-        flags = 0 if case_sensitive else re.IGNORECASE
-        matches = []
-        
-        for i, line in enumerate(self.current_content.split('\n')):
-            if re.search(pattern, line, flags):
-                matches.append((i + 1, line))
-        
-        return matches
+        regex = _compiled(pattern, 0 if case_sensitive else re.IGNORECASE)
+        return [(i + 1, line) for i, line in enumerate(self._lines) if regex.search(line)]
     
     def replace_text(self, pattern: str, replacement: str, case_sensitive: bool = False) -> int:
         """Replace text pattern in content."""
         if self.current_content is None:
             return 0
         
-        flags = 0 if case_sensitive else re.IGNORECASE
-        new_content, count = re.subn(pattern, replacement, self.current_content, flags=flags)
+        regex = _compiled(pattern, 0 if case_sensitive else re.IGNORECASE)
+        new_content, count = regex.subn(replacement, self.current_content)
         
         if count > 0:
-            self.current_content = new_content
-            self.history.append({
-                "operation": EditOperation(
+            self._record_splice(
+                EditOperation(
                     type=EditType.REPLACE_TEXT,
                     old_text=pattern,
                     new_text=replacement
                 ),
-                "old_content": self.current_content,
-                "new_content": new_content
-            })
+                0, self._lines[:], new_content.split('\n')
+            )
+            self._content = new_content
         
         return count
     
@@ -306,12 +324,28 @@ class CodeEditor:
             return False
         
         last_edit = self.history.pop()
-        self.current_content = last_edit["old_content"]
+        start = last_edit["start"]
+        self._lines[start:start + last_edit["new_count"]] = last_edit["old_lines"]
+        self._content = None
         return True
     
     def get_history(self) -> List[Dict[str, Any]]:
         """Get edit history."""
-        return self.history.copy()
+        # Entries only keep the touched lines, so rebuild each edit's full
+        # old_content and new_content by unwinding them from the buffer
+        lines = list(self._lines or [])
+        entries = []
+        for edit in reversed(self.history):
+            new_content = '\n'.join(lines)
+            start = edit["start"]
+            lines[start:start + edit["new_count"]] = edit["old_lines"]
+            entries.append({
+                "operation": edit["operation"],
+                "old_content": '\n'.join(lines),
+                "new_content": new_content
+            })
+        entries.reverse()
+        return entries
     
     def clear_history(self) -> None:
         """Clear edit history."""
@@ -378,11 +412,11 @@ class CodeEditor:
         # Simple pattern matching for common operations
         if "add" in instruction.lower() and "line" in instruction.lower():
             # Extract line number and text
-            match = re.search(r'line\s+(\d+)', instruction)
+            match = _LINE_RE.search(instruction)
             if match:
                 line_num = int(match.group(1))
                 # Extract text to add (simplified)
-                text_match = re.search(r'add\s+"([^"]+)"', instruction)
+                text_match = _ADD_RE.search(instruction)
                 if text_match:
                     text = text_match.group(1)
                     edits.append(EditOperation(
@@ -393,10 +427,10 @@ class CodeEditor:
         
         elif "replace" in instruction.lower() and "line" in instruction.lower():
             # Extract line number and new text
-            match = re.search(r'line\s+(\d+)', instruction)
+            match = _LINE_RE.search(instruction)
             if match:
                 line_num = int(match.group(1))
-                text_match = re.search(r'with\s+"([^"]+)"', instruction)
+                text_match = _WITH_RE.search(instruction)
                 if text_match:
                     text = text_match.group(1)
                     edits.append(EditOperation(
@@ -407,7 +441,7 @@ class CodeEditor:
         
         elif "delete" in instruction.lower() and "line" in instruction.lower():
             # Extract line number
-            match = re.search(r'line\s+(\d+)', instruction)
+            match = _LINE_RE.search(instruction)
             if match:
                 line_num = int(match.group(1))
                 edits.append(EditOperation(
@@ -13,7 +13,6 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
-from .core import PointerCLI
 from .config import Config
 from .utils import get_config_path, ensure_config_dir
 
@@ -64,6 +63,7 @@ def cli_main(
                 return
         
         # Initialize and run the CLI
+        from .core import PointerCLI
         cli = PointerCLI(config)
         cli.run()
         
@@ -34,7 +34,7 @@ class ModeManager:
             self.current_mode = "auto_run"
             self.config.mode.auto_run_mode = True
         
-        self.config.save()
+        self.config.request_save()
         return self.current_mode
     
     def set_mode(self, mode: str) -> bool:
@@ -49,7 +49,7 @@ class ModeManager:
         else:
             self.config.mode.auto_run_mode = False
         
-        self.config.save()
+        self.config.request_save()
         return True
     
     def should_execute_tool(self, tool_name: str, tool_args: Dict[str, Any]) -> bool:
@@ -25,6 +25,12 @@ from .utils import (
 class ToolManager:
     """Manages tool execution for Pointer CLI."""
     
+    # Tools that don't modify the filesystem, so adjacent calls may run concurrently
+    READ_ONLY_TOOLS = frozenset({
+        "read_file", "search_files", "search_content", "list_directory",
+        "get_file_info", "create_diff",
+    })
+    
     def __init__(self, config: Config, console: Console):
         self.config = config
         self.console = console
@@ -358,7 +364,6 @@ class ToolManager:
         
         try:
             if use_regex:
-                import re
                 # Compile regex pattern
                 flags = 0 if case_sensitive else re.IGNORECASE
                 regex_pattern = re.compile(query, flags)
@@ -4,12 +4,20 @@ Utility functions for Pointer CLI.
 
 import os
 import sys
+import functools
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 import json
+import dataclasses
 import yaml
 import toml
 
+# orjson is optional; fall back to the standard library when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def get_config_path() -> Path:
     """Get the configuration directory path."""
     return Path.home() / ".pointer-cli"
@@ -61,18 +69,36 @@ def is_text_file(file_path: Path) -> bool:
     
     return False
 
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON from str or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_default(obj: Any) -> Any:
+    """Serialize dataclass instances field by field without copying nested values."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object (dataclasses included) to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, default=_json_default, indent=2 if indent else None,
+                      ensure_ascii=False).encode('utf-8')
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+@functools.lru_cache(maxsize=4096)
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
     if size_bytes == 0:
         return "0B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-    
-    return f"{size_bytes:.1f}{size_names[i]}"
+    # Each unit is 2**10 of the previous, so the bit length picks the unit
+    i = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1) if size_bytes > 0 else 0
+    return f"{size_bytes / (1 << (10 * i)):.1f}{_SIZE_UNITS[i]}"
 
 def get_file_info(file_path: Path) -> Dict[str, Any]:
     """Get comprehensive file information."""
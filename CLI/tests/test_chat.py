@@ -0,0 +1,252 @@
+"""
+Tests for the chat interface.
+"""
+
+import asyncio
+import io
+import json
+import threading
+import pytest
+from aiohttp import web
+
+from pointer_cli.chat import ChatInterface, _ThinkingSplitter
+from pointer_cli.config import Config
+from rich.console import Console
+
+
+class _FakeContent:
+    """Stand-in for an aiohttp response body that arrives in fixed chunks."""
+
+    def __init__(self, chunks, received):
+        self.chunks = chunks
+        self.received = received
+
+    async def _iter(self):
+        for chunk in self.chunks:
+            self.received.append(chunk)
+            yield chunk
+
+    def iter_any(self):
+        return self._iter()
+
+
+class _FakeResponse:
+    def __init__(self, chunks):
+        self.received = []
+        self.content = _FakeContent(chunks, self.received)
+
+
+def _sse_event(payload, eol=b"\n"):
+    return b"data: " + json.dumps(payload).encode() + eol + eol
+
+
+def _split(deltas):
+    splitter = _ThinkingSplitter()
+    for delta in deltas:
+        splitter.feed(delta)
+    splitter.flush()
+    return splitter.get_thinking(), splitter.get_main()
+
+
+class TestThinkingSplitter:
+    """Test routing of streamed deltas into thinking and main text."""
+
+    def test_tags_split_across_deltas(self):
+        """Test tags broken over several deltas are still recognised."""
+        deltas = ["<", "thi", "nk>plan", "ning</", "think", ">Answer"]
+
+        assert _split(deltas) == ("planning", "Answer")
+
+    def test_split_at_every_position(self):
+        """Test every single split point of a response gives the same result."""
+        text = "Intro <think>step one</think>Result"
+        for i in range(len(text) + 1):
+            assert _split([text[:i], text[i:]]) == ("step one", "Intro Result")
+
+    def test_multiple_blocks(self):
+        """Test several thinking blocks are concatenated in order."""
+        deltas = ["<think>a</think>", "one ", "<think>b</th", "ink>two"]
+
+        assert _split(deltas) == ("ab", "one two")
+
+    def test_unterminated_think(self):
+        """Test text after an unclosed <think> stays thinking once the stream ends."""
+        assert _split(["Hi <think>still ", "going</thi"]) == ("still going</thi", "Hi")
+
+    def test_partial_open_tag_at_end(self):
+        """Test a trailing partial tag is flushed as ordinary text."""
+        assert _split(["Done <thi"]) == ("", "Done <thi")
+
+    def test_text_resembling_tags(self):
+        """Test angle brackets that never complete a tag pass through."""
+        assert _split(["a < b", " <thinking> c"]) == ("", "a < b <thinking> c")
+
+
+class TestChatInterface:
+    """Test chat interface functionality."""
+
+    @pytest.fixture
+    def chat(self):
+        """Create a chat interface for testing."""
+        config = Config()
+        config.codebase.include_context = False
+        return ChatInterface(config, Console(quiet=True))
+
+    def _collect(self, chat, response):
+        """Read all events, noting how many chunks had arrived when each was yielded."""
+        async def run():
+            events = []
+            async for data in chat._iter_sse_events(response):
+                events.append((json.loads(data) if data != b"[DONE]" else data, len(response.received)))
+            return events
+        return asyncio.run(run())
+
+    def _ask_server(self, chat, completions):
+        """Send one message to a local server whose completions endpoint is the given handler."""
+        async def run():
+            app = web.Application()
+            app.router.add_post("/v1/chat/completions", completions)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            host, port = runner.addresses[0][:2]
+            chat.config.api.base_url = f"http://{host}:{port}"
+            try:
+                return await chat.get_ai_response_with_tokens("hi", {})
+            finally:
+                await chat.close()
+                await runner.cleanup()
+        return asyncio.run(run())
+
+    @pytest.mark.parametrize("eol", [b"\n", b"\r\n", b"\r"])
+    def test_sse_events_yield_per_line(self, chat, eol):
+        """Test each event is yielded as soon as its line arrives, whatever the line ending."""
+        chunks = [
+            _sse_event({"n": 1}, eol),
+            _sse_event({"n": 2}, eol)[:5],
+            _sse_event({"n": 2}, eol)[5:],
+            b"data: [DONE]" + eol + eol,
+        ]
+
+        events = self._collect(chat, _FakeResponse(chunks))
+
+        assert events == [({"n": 1}, 1), ({"n": 2}, 3), (b"[DONE]", 4)]
+
+    def test_sse_crlf_split_between_chunks(self, chat):
+        """Test a CRLF split across chunks does not merge or drop lines."""
+        chunks = [b'data: {"n": 1}\r', b'\n\r\ndata: {"n": 2}\r\n\r\n']
+
+        events = self._collect(chat, _FakeResponse(chunks))
+
+        assert [event for event, _ in events] == [{"n": 1}, {"n": 2}]
+
+    def test_sse_oversized_event(self, chat):
+        """Test an event larger than aiohttp's readline limit is still parsed."""
+        content = "x" * (300 * 1024)
+        event = _sse_event({"content": content})
+        chunks = [event[i:i + 16384] for i in range(0, len(event), 16384)]
+
+        events = self._collect(chat, _FakeResponse(chunks))
+
+        assert len(events) == 1
+        assert events[0][0]["content"] == content
+
+    def test_sse_final_line_without_newline(self, chat):
+        """Test a trailing data line is yielded when the stream ends without a blank line."""
+        events = self._collect(chat, _FakeResponse([b'data: {"n": 1}']))
+
+        assert [event for event, _ in events] == [{"n": 1}]
+
+    def test_read_input_uses_one_daemon_thread(self, chat):
+        """Test prompts share one daemon thread, so a pending prompt never blocks exit."""
+        async def run():
+            first = await chat.read_input(threading.current_thread)
+            second = await chat.read_input(threading.current_thread)
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first is second
+        assert first is not threading.main_thread()
+        assert first.daemon
+
+    def test_read_input_propagates_errors(self, chat):
+        """Test an exception raised by the prompt reaches the caller."""
+        def prompt():
+            raise EOFError
+
+        with pytest.raises(EOFError):
+            asyncio.run(chat.read_input(prompt))
+
+    def test_repeated_prompt_always_reaches_model(self, chat):
+        """Test an identical request is sent again rather than replaying an earlier reply."""
+        requests = []
+        reply = "```tool\nname: write_file\nargs:\n  path: a.txt\n  content: hi\n```"
+
+        async def fake_stream_call(request_data):
+            requests.append(request_data)
+            return reply, 7, 20, 0
+
+        chat._stream_call = fake_stream_call
+
+        async def run():
+            first = await chat.get_ai_response_with_tokens("write a.txt", {})
+            chat.clear_history()
+            second = await chat.get_ai_response_with_tokens("write a.txt", {})
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert len(requests) == 2
+        assert requests[0] == requests[1]
+        assert first == second == (reply, 7, 20, 0)
+
+    def test_stream_panel_shows_reported_tokens(self, chat):
+        """Test the final panel shows the server's completion_tokens, not the estimate."""
+        async def completions(request):
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            await response.write(_sse_event({"choices": [{"delta": {"content": "x" * 400}}]}))
+            await response.write(_sse_event({"choices": [], "usage": {"completion_tokens": 9, "prompt_tokens": 30}}))
+            await response.write(b"data: [DONE]\n\n")
+            return response
+
+        output = io.StringIO()
+        chat.console = Console(file=output, force_terminal=True, width=100)
+        response, tokens, prompt_tokens, _ = self._ask_server(chat, completions)
+
+        assert (len(response), tokens, prompt_tokens) == (400, 9, 30)
+        # The estimate may show while streaming; the final render uses the reported count
+        rendered = output.getvalue()
+        assert rendered[rendered.rfind("Tokens: "):].startswith("Tokens: 9 ")
+
+    def test_retry_budget_not_repeated_by_fallback(self, chat):
+        """Test a persistent 503 uses max_retries requests in total, with no non-streaming fallback."""
+        requests = []
+
+        async def completions(request):
+            requests.append(await request.json())
+            return web.Response(status=503, text="overloaded")
+
+        chat.RETRY_BASE_DELAY = 0
+        with pytest.raises(Exception, match="API error 503: overloaded"):
+            self._ask_server(chat, completions)
+
+        assert len(requests) == chat.config.api.max_retries
+        assert all(body["stream"] is True for body in requests)
+
+    def test_connection_error_retried_once(self, chat):
+        """Test a dropped connection is retried once, not for the whole retry budget."""
+        requests = []
+
+        async def completions(request):
+            requests.append(request)
+            request.transport.close()
+            return web.Response()
+
+        chat.RETRY_BASE_DELAY = 0
+        with pytest.raises(Exception, match="Network error"):
+            self._ask_server(chat, completions)
+
+        assert len(requests) == 2
@@ -0,0 +1,124 @@
+"""
+Tests for chat persistence.
+"""
+
+import pytest
+
+from pointer_cli.chat_manager import ChatManager
+
+
+class TestChatManager:
+    """Test chat saving, journaling and listing."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Create a chat manager storing chats in a temporary directory."""
+        return ChatManager(tmp_path)
+
+    def _saved_chat(self, manager):
+        chat = manager.create_new_chat("Test chat")
+        manager.add_messages([
+            manager.make_message("user", "hello"),
+            manager.make_message("assistant", "hi", 5),
+        ])
+        manager.save_chat()
+        return chat
+
+    def test_unsaved_chat_is_not_journaled(self, manager):
+        """Test messages of a never-saved chat stay in memory only."""
+        chat = manager.create_new_chat("Draft")
+        manager.add_message("user", "hello")
+
+        assert not manager._journal_path(chat.id).exists()
+        assert manager.list_chats() == []
+
+    def test_journal_replays_after_save(self, manager, tmp_path):
+        """Test messages added after a save are journaled and replayed on load."""
+        chat = self._saved_chat(manager)
+        manager.add_messages([
+            manager.make_message("user", "more"),
+            manager.make_message("assistant", "sure", 7),
+        ])
+
+        assert manager._journal_path(chat.id).exists()
+
+        reloaded = ChatManager(tmp_path).load_chat(chat.id)
+
+        assert [message.content for message in reloaded.messages] == ["hello", "hi", "more", "sure"]
+        assert reloaded.total_tokens == 12
+        assert reloaded.last_modified == reloaded.messages[-1].timestamp
+
+    def test_index_tracks_journaled_messages(self, manager, tmp_path):
+        """Test the chat listing reflects messages added since the last save."""
+        chat = self._saved_chat(manager)
+        manager.add_messages([manager.make_message("assistant", "later", 3)])
+
+        for listing in (manager.list_chats(), ChatManager(tmp_path).list_chats()):
+            assert listing[0]["message_count"] == 3
+            assert listing[0]["total_tokens"] == 8
+            assert listing[0]["last_modified"] == chat.messages[-1].timestamp
+
+    def test_index_rebuild_counts_journal(self, manager, tmp_path):
+        """Test a missing index is rebuilt from chat files and their journals."""
+        chat = self._saved_chat(manager)
+        manager.add_message("user", "after save", 2)
+        manager._close_journal()
+        manager.index_file.unlink()
+
+        listing = ChatManager(tmp_path).list_chats()
+
+        assert [entry["id"] for entry in listing] == [chat.id]
+        assert listing[0]["message_count"] == 3
+        assert listing[0]["total_tokens"] == 7
+
+    def test_torn_journal_line_is_skipped(self, manager, tmp_path):
+        """Test a line torn by a crash neither breaks replay nor later appends."""
+        chat = self._saved_chat(manager)
+        manager.add_message("user", "before crash")
+        manager._close_journal()
+        with open(manager._journal_path(chat.id), "ab") as f:
+            f.write(b'{"index": 3, "message": {"role": "assis')
+
+        other = ChatManager(tmp_path)
+        other.load_chat(chat.id)
+        other.add_message("user", "after crash")
+
+        reloaded = ChatManager(tmp_path).load_chat(chat.id)
+        assert [message.content for message in reloaded.messages] == [
+            "hello", "hi", "before crash", "after crash"
+        ]
+
+    def test_save_clears_journal(self, manager, tmp_path):
+        """Test saving folds the journal into the snapshot and removes it."""
+        chat = self._saved_chat(manager)
+        manager.add_message("user", "more")
+        manager.save_chat()
+
+        assert not manager._journal_path(chat.id).exists()
+        assert len(ChatManager(tmp_path).load_chat(chat.id).messages) == 3
+
+    def test_add_messages_leaves_index_alone(self, manager):
+        """Test a turn only appends to the journal instead of rewriting the index."""
+        self._saved_chat(manager)
+        before = manager.index_file.read_bytes()
+        manager.add_message("user", "more")
+
+        assert manager.index_file.read_bytes() == before
+
+    def test_sessions_keep_each_others_chats(self, tmp_path):
+        """Test chats saved or removed by another session are seen and kept."""
+        first, second = ChatManager(tmp_path), ChatManager(tmp_path)
+        first_chat = self._saved_chat(first)
+        assert [entry["id"] for entry in second.list_chats()] == [first_chat.id]
+
+        second_chat = second.create_new_chat("Other chat")
+        second_chat.id += "_other"
+        second.save_chat()
+        first.add_message("user", "still here")
+        first.save_chat()
+
+        for manager in (first, second):
+            assert sorted(entry["id"] for entry in manager.list_chats()) == sorted([first_chat.id, second_chat.id])
+
+        (first.chats_dir / f"{second_chat.id}.json").unlink()
+        assert [entry["id"] for entry in first.list_chats()] == [first_chat.id]
@@ -0,0 +1,48 @@
+"""
+Tests for codebase context analysis.
+"""
+
+import pytest
+
+from pointer_cli.codebase_context import CodebaseContext
+from pointer_cli.config import Config
+
+
+class TestCodebaseContext:
+    """Test codebase context functionality."""
+
+    @pytest.fixture
+    def context(self, tmp_path):
+        """Create a context rooted at a temporary project."""
+        (tmp_path / "README.md").write_bytes(b"# Project\r\nSecond line\r\n")
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "main.py").write_text("print('hi')\n")
+        # Binary content behind a text extension is only found when read
+        (tmp_path / "pkg" / "data.txt").write_bytes(b"\x00\x01" * 600)
+        # Extensionless files are sniffed during the scan
+        (tmp_path / "blob").write_bytes(b"\x7fELF\x00\x00")
+        (tmp_path / "NOTES").write_text("plain notes\n")
+
+        config = Config()
+        config.codebase.context_file_types.append("")
+        context = CodebaseContext(config)
+        context.project_root = tmp_path
+        return context
+
+    def test_binary_files_are_left_out(self, context):
+        """Test binary files are not counted, summarized or searchable."""
+        context.get_context_for_prompt()
+        summary = context.get_context_summary()
+
+        assert sorted(context.context_cache) == ["NOTES", "README.md", "pkg/main.py"]
+        assert summary["total_files"] == 3
+        assert summary["file_types"] == {".md": 1, ".py": 1, "": 1}
+        assert summary["structure"]["pkg"]["files"] == 1
+        assert context.search_context("data") == []
+
+    def test_preview_uses_universal_newlines(self, context):
+        """Test CRLF files are previewed without carriage returns."""
+        file_info = context.get_file_context("README.md")
+
+        assert file_info.content_preview == "# Project\nSecond line\n"
+        assert file_info.lines == 3
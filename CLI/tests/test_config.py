@@ -2,11 +2,15 @@
 Tests for configuration management.
 """
 
+import copy
+import gc
 import json
 import tempfile
+import weakref
 from pathlib import Path
 import pytest
 
+from pointer_cli import config as config_module
 from pointer_cli.config import Config, APIConfig, UIConfig, ModeConfig
 
 class TestConfig:
@@ -102,3 +106,70 @@ class TestConfig:
             auto_run_mode=False
         )
         assert config.mode.auto_run_mode is False
+    
+    def test_config_request_save_coalesces(self, monkeypatch):
+        """Test that setter saves are coalesced and written on flush."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.json"
+            monkeypatch.setattr(Config, "get_default_config_path", classmethod(lambda cls: config_file))
+            
+            config = Config()
+            config.toggle_auto_run_mode()
+            config.update_ui_config(theme="dark")
+            assert not config_file.exists()
+            
+            config.flush()
+            loaded_config = Config.load(str(config_file))
+            assert loaded_config.mode.auto_run_mode is False
+            assert loaded_config.ui.theme == "dark"
+    
+    def test_config_version_bumps_on_change(self, monkeypatch):
+        """Test that changing a setting bumps the config version."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.json"
+            monkeypatch.setattr(Config, "get_default_config_path", classmethod(lambda cls: config_file))
+            
+            config = Config()
+            version = config.version
+            config.toggle_auto_run_mode()
+            config.update_ui_config(theme="dark")
+            assert config.version == version + 2
+            
+            config.flush()
+            assert config.version == version + 2
+    
+    def test_config_deep_copy_with_pending_save(self, monkeypatch):
+        """Test that a config can be deep-copied while a save is pending."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.json"
+            monkeypatch.setattr(Config, "get_default_config_path", classmethod(lambda cls: config_file))
+            
+            config = Config()
+            config.update_ui_config(theme="dark")
+            
+            for copied in (copy.deepcopy(config), config.model_copy(deep=True)):
+                assert copied.ui.theme == "dark"
+                # The copy has no pending save of its own
+                copied.flush()
+                assert not config_file.exists()
+            
+            config.flush()
+            assert Config.load(str(config_file)).ui.theme == "dark"
+    
+    def test_config_pending_save_flushed_at_exit(self, monkeypatch):
+        """Test the exit hook writes pending saves without keeping configs alive."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.json"
+            monkeypatch.setattr(Config, "get_default_config_path", classmethod(lambda cls: config_file))
+            monkeypatch.setattr(Config, "SAVE_DELAY", 60.0)
+            
+            config = Config()
+            config.toggle_auto_run_mode()
+            config_module._flush_pending_saves()
+            assert Config.load(str(config_file)).mode.auto_run_mode is False
+            
+            # Once flushed, nothing but the caller holds the config
+            ref = weakref.ref(config)
+            del config
+            gc.collect()
+            assert ref() is None
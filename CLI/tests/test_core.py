@@ -0,0 +1,142 @@
+"""
+Tests for the main CLI loop.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+
+from pointer_cli import chat as chat_module
+from pointer_cli import config as config_module
+from pointer_cli.config import Config
+from pointer_cli.core import PointerCLI
+
+
+class TestPointerCLI:
+    """Test PointerCLI message handling."""
+
+    @pytest.fixture
+    def cli(self, tmp_path, monkeypatch):
+        """Create a CLI whose config and chats live in a temporary directory."""
+        monkeypatch.setattr(config_module, "_default_config_path", lambda: tmp_path / "config.json")
+        config = Config()
+        config.codebase.include_context = False
+        cli = PointerCLI(config)
+        cli.console.quiet = True
+        yield cli
+        asyncio.run(cli.chat_interface.close())
+
+    def test_shutdown_request_cancels_pending_prompt(self, cli, monkeypatch):
+        """Test the SIGINT handler's cancellation promptly ends a task waiting at the You prompt."""
+        release = threading.Event()
+        prompted = threading.Event()
+
+        def blocking_prompt(*args, **kwargs):
+            prompted.set()
+            release.wait()
+            return ""
+
+        monkeypatch.setattr(chat_module.Prompt, "ask", blocking_prompt)
+
+        async def run():
+            main_task = asyncio.ensure_future(cli.chat_interface.get_user_input())
+            while not prompted.is_set():
+                await asyncio.sleep(0.01)
+
+            start = time.monotonic()
+            cli._request_shutdown(main_task)
+            with pytest.raises(asyncio.CancelledError):
+                await main_task
+            return time.monotonic() - start
+
+        try:
+            elapsed = asyncio.run(run())
+        finally:
+            release.set()
+
+        assert elapsed < 0.5
+        assert cli.running is False
+
+    def test_exit_command_shuts_down(self, cli, monkeypatch):
+        """Test /exit saves the chat and closes the chat interface like Ctrl+C does."""
+        closed = []
+        close = cli.chat_interface.close
+
+        async def recording_close():
+            closed.append(True)
+            await close()
+
+        monkeypatch.setattr(chat_module.Prompt, "ask", lambda *args, **kwargs: "/exit")
+        monkeypatch.setattr(cli.chat_interface, "close", recording_close)
+        chat = cli.chat_manager.create_new_chat("Exit chat")
+        cli.chat_manager.add_message("user", "bye")
+
+        with pytest.raises(SystemExit) as exit_info:
+            cli.run()
+
+        assert exit_info.value.code == 0
+        assert closed == [True]
+        assert [entry["id"] for entry in cli.chat_manager.list_chats()] == [chat.id]
+
+    def test_context_refresh_follows_new_project_root(self, cli, tmp_path, monkeypatch):
+        """Test /context refresh rescans the repository the CLI is now in."""
+        for name in ("old", "new"):
+            (tmp_path / name / ".git").mkdir(parents=True)
+            (tmp_path / name / f"{name}.py").write_text("pass\n")
+
+        monkeypatch.chdir(tmp_path / "old")
+        cli.config.codebase.include_context = True
+        asyncio.run(cli._handle_command("/context refresh"))
+        assert list(cli.chat_interface.codebase_context.context_cache) == ["old.py"]
+
+        monkeypatch.chdir(tmp_path / "new")
+        asyncio.run(cli._handle_command("/context refresh"))
+
+        assert cli.current_context["project_root"] == tmp_path / "new"
+        assert cli.chat_interface.codebase_context.project_root == tmp_path / "new"
+        assert list(cli.chat_interface.codebase_context.context_cache) == ["new.py"]
+
+    def _record_message_writes(self, cli, monkeypatch):
+        """Save a chat and record every add_messages call made after that."""
+        cli.chat_manager.create_new_chat("Test chat")
+        cli.chat_manager.save_chat()
+        calls = []
+        add_messages = cli.chat_manager.add_messages
+
+        def recording_add_messages(messages):
+            messages = list(messages)
+            calls.append([(message.role, message.content, message.tokens_used) for message in messages])
+            add_messages(messages)
+
+        monkeypatch.setattr(cli.chat_manager, "add_messages", recording_add_messages)
+        return calls
+
+    def test_turn_messages_written_together(self, cli, monkeypatch):
+        """Test a turn's user and assistant messages reach the chat in one write."""
+        calls = self._record_message_writes(cli, monkeypatch)
+
+        async def fake_response(message, context):
+            return "Hello!", 5, 40, 0
+
+        monkeypatch.setattr(cli.chat_interface, "get_ai_response_with_tokens", fake_response)
+
+        asyncio.run(cli._process_user_message("hi"))
+
+        assert calls == [[("user", "hi", 0), ("assistant", "Hello!", 5)]]
+        journal = cli.chat_manager._journal_path(cli.chat_manager.current_chat.id)
+        assert len(journal.read_bytes().splitlines()) == 2
+
+    def test_turn_messages_written_when_ai_fails(self, cli, monkeypatch):
+        """Test the user's message is still recorded when the AI request raises."""
+        calls = self._record_message_writes(cli, monkeypatch)
+
+        async def failing_response(message, context):
+            raise Exception("Error getting AI response: connection refused")
+
+        monkeypatch.setattr(cli.chat_interface, "get_ai_response_with_tokens", failing_response)
+
+        asyncio.run(cli._process_user_message("hi"))
+
+        assert calls == [[("user", "hi", 0)]]
+        assert [message.content for message in cli.chat_manager.current_chat.messages] == ["hi"]
@@ -192,6 +192,45 @@ class TestCodeEditor:
         assert success is True
         assert editor.current_content == original_content
     
+    def test_undo_insert_and_delete(self, editor, temp_file):
+        """Test undo of line inserts and deletes."""
+        editor.load_file(temp_file)
+        original_content = editor.current_content
+        
+        editor.apply_edit(EditOperation(type=EditType.INSERT_LINE, line=1, text="New"))
+        editor.apply_edit(EditOperation(type=EditType.DELETE_LINE, line=4))
+        assert editor.current_content == "Line 1\nNew\nLine 2\nLine 4"
+        
+        history = editor.get_history()
+        assert [entry["operation"].type for entry in history] == [EditType.INSERT_LINE, EditType.DELETE_LINE]
+        assert history[0]["old_content"] == original_content
+        assert history[0]["new_content"] == history[1]["old_content"] == "Line 1\nNew\nLine 2\nLine 3\nLine 4"
+        assert history[1]["new_content"] == editor.current_content
+        
+        assert editor.undo() is True
+        assert editor.current_content == "Line 1\nNew\nLine 2\nLine 3\nLine 4"
+        assert editor.undo() is True
+        assert editor.current_content == original_content
+        assert editor.undo() is False
+    
+    def test_undo_multiline_replace_text(self, editor, temp_file):
+        """Test undo of replacements that change the number of lines."""
+        editor.load_file(temp_file)
+        original_content = editor.current_content
+        
+        assert editor.replace_text(r"Line (2|3)", "A\\1\nB\\1") == 2
+        assert editor.current_content == "Line 1\nA2\nB2\nA3\nB3\nLine 4"
+        assert editor.get_line_count() == 6
+        
+        editor.apply_edit(EditOperation(type=EditType.REPLACE_TEXT, old_text="B2\nA3", new_text="C"))
+        assert editor.current_content == "Line 1\nA2\nC\nB3\nLine 4"
+        
+        assert editor.undo() is True
+        assert editor.current_content == "Line 1\nA2\nB2\nA3\nB3\nLine 4"
+        assert editor.undo() is True
+        assert editor.current_content == original_content
+        assert editor.get_line(2) == "Line 2"
+    
     def test_find_text(self, editor, temp_file):
         """Test text finding functionality."""
         editor.load_file(temp_file)
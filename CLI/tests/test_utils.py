@@ -3,12 +3,14 @@ Tests for utility functions.
 """
 
 import tempfile
+from dataclasses import dataclass, field
 from pathlib import Path
 import pytest
 
 from pointer_cli.utils import (
     safe_read_file, safe_write_file, create_diff, format_file_size,
-    is_text_file, get_file_info, find_files, truncate_output
+    is_text_file, get_file_info, find_files, truncate_output,
+    json_loads, json_dumps_bytes
 )
 
 class TestUtils:
@@ -103,3 +105,34 @@ class TestUtils:
         lines = truncated.split('\n')
         assert len(lines) == 101  # 100 lines + truncation message
         assert "... (50 more lines)" in truncated
+    
+    def test_json_round_trip(self):
+        """Test JSON helpers round-trip non-ASCII content."""
+        data = {"title": "Café ☕", "messages": [{"role": "user", "tokens_used": 3}]}
+        
+        encoded = json_dumps_bytes(data, indent=True)
+        assert isinstance(encoded, bytes)
+        assert "Café ☕".encode("utf-8") in encoded
+        assert b"\n  " in encoded
+        
+        assert json_loads(encoded) == data
+        assert json_loads(encoded.decode("utf-8")) == data
+    
+    def test_json_dumps_dataclass(self):
+        """Test JSON helpers serialize nested dataclasses."""
+        @dataclass
+        class Message:
+            role: str
+            tokens_used: int = 0
+        
+        @dataclass
+        class Session:
+            id: str
+            messages: list = field(default_factory=list)
+        
+        session = Session(id="chat_1", messages=[Message("user", 3)])
+        
+        assert json_loads(json_dumps_bytes(session)) == {
+            "id": "chat_1",
+            "messages": [{"role": "user", "tokens_used": 3}]
+        }